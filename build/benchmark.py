@@ -0,0 +1,357 @@
+"""
+Benchmark of the Blueprint build and validation pipeline.
+
+This script generates a synthetic tree of Blueprints (following the
+blueprints/<letter>/<Series (Year)>/<id>/blueprint.json layout) of a
+configurable size, and then times each stage of the build against it:
+
+- Globbing all blueprint.json files
+- Parsing the JSON of all Blueprints
+- Validating all Blueprints with the (parallel) validation engine
+- Aggregating the Series blueprints.json files
+- Aggregating the master blueprint file
+- Updating the Blueprint statistics cache
+- Rendering the Series and master READMEs
+- Normalizing preview images
+- Running the full build (`build_all.py --full`) of the entire tree
+- Running the incremental build of the (unchanged) tree
+
+The wall time and peak (Python) memory of each stage are written as JSON
+so that regressions are visible. For example:
+
+    python -m build.benchmark --blueprints 10000 --output bench.json
+"""
+
+from argparse import ArgumentParser
+from contextlib import contextmanager
+from cProfile import Profile
+from json import dumps
+from pathlib import Path
+from platform import python_version
+from random import Random
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from tracemalloc import get_traced_memory, start as start_tracing, stop as stop_tracing
+from typing import Iterator, Optional
+
+from PIL import Image
+
+from build.blueprint_statistics import StatisticsCache
+from build.build_all import build_all
+from build.build_master_blueprint import build_master_entries
+from build.build_master_readme import build_master_readme
+from build.build_series_blueprints import build_series_blueprints
+from build.build_series_readme import build_series_readme
+from build.resize_images import normalize_preview
+from build.utils import format_json, get_blueprint_folders, loads
+from models.validation import validate_blueprints
+
+
+CARD_TYPES = ('standard', 'anime', 'tinted frame', 'olivier', 'roman numeral')
+WORDS = (
+    'The', 'Big', 'Bang', 'Theory', 'Office', 'Breaking', 'Bad', 'Doctor',
+    'Who', 'Star', 'Trek', 'Lost', 'Boys', 'Good', 'Place', 'House', 'Of',
+    'Dragon', 'Wire', 'Sopranos', 'Avatar', 'Last', 'Airbender', 'Rick',
+)
+PREVIEW_SIZE = (1280, 720)
+
+
+def generate_blueprint(random: Random, index: int) -> dict:
+    """Generate a random (valid) Blueprint."""
+
+    episode_count = random.randint(0, 20)
+    # Second Font is only utilized by Episodes
+    font_count = random.randint(0, 2 if episode_count else 1)
+    template_count = random.randint(0, 3)
+    fonts = [
+        {
+            'name': f'Font {index}-{font_id}',
+            'color': 'rgb(255,255,255)',
+            'file': f'font{font_id}.ttf',
+            'size': round(random.uniform(0.8, 1.3), 2),
+        }
+        for font_id in range(font_count)
+    ]
+    templates = [
+        {
+            'name': f'Template {template_id}',
+            'filters': [{
+                'argument': random.choice(('Absolute Number', 'Season Number', 'Episode Title')),
+                'operation': 'is not null',
+                'reference': '',
+            }],
+        }
+        for template_id in range(template_count)
+    ]
+    episodes = {
+        f's{random.randint(0, 10)}e{episode}': {
+            'season_text': random.choice(WORDS),
+            **({'font_id': font_count - 1} if font_count else {}),
+        }
+        for episode in range(episode_count)
+    }
+
+    return {
+        'series': {
+            'card_type': random.choice(CARD_TYPES),
+            'template_ids': list(range(template_count)),
+            **({'font_id': 0} if font_count else {}),
+            'season_title_ranges': ['1-10', '11-20'],
+            'season_title_values': ['Part One', 'Part Two'],
+        },
+        'episodes': episodes,
+        'templates': templates,
+        'fonts': fonts,
+        'preview': 'preview.jpg',
+        'creator': ', '.join(random.sample(('CollinHeist', 'Someone', 'Else', 'User'), random.randint(1, 2))),
+        'description': ['Synthetic Blueprint for benchmarking.'],
+        'created': f'2023-{random.randint(1, 12):02}-01T00:00:00',
+    }
+
+
+def generate_tree(
+        blueprint_folder: Path,
+        blueprint_count: int,
+        image_count: int,
+        seed: int = 0,
+    ) -> None:
+    """
+    Generate a synthetic tree of Blueprints.
+
+    Args:
+        blueprint_folder: Root folder to create the Blueprints within.
+        blueprint_count: Number of Blueprints to create.
+        image_count: Number of Blueprints to write a (real) preview
+            image for. All other previews are empty placeholders.
+        seed: Seed of the random generator.
+    """
+
+    random = Random(seed)
+    preview = Image.new('RGB', PREVIEW_SIZE, 'gray')
+
+    index, series_index = 0, 0
+    while index < blueprint_count:
+        name = ' '.join(random.sample(WORDS, random.randint(1, 4)))
+        letter, folder_name = get_blueprint_folders(
+            f'{name} {series_index} ({random.randint(1950, 2024)})'
+        )
+        series_subfolder = blueprint_folder / letter / folder_name
+        series_index += 1
+
+        for blueprint_id in range(min(random.randint(1, 5), blueprint_count - index)):
+            subfolder = series_subfolder / str(blueprint_id)
+            subfolder.mkdir(parents=True)
+            blueprint = generate_blueprint(random, index)
+            (subfolder / 'blueprint.json').write_text(format_json(blueprint))
+            for font in blueprint['fonts']:
+                (subfolder / font['file']).write_bytes(b'\0' * 1024)
+            if index < image_count:
+                preview.save(subfolder / 'preview.jpg')
+            else:
+                (subfolder / 'preview.jpg').touch()
+            index += 1
+
+
+class Benchmark:
+    """
+    Timer of the wall time and peak memory of each stage. Tracing memory
+    allocations adds considerable overhead to the wall time, so it can
+    be disabled for more accurate timings.
+    """
+
+    def __init__(self,
+            profile_folder: Optional[Path] = None,
+            trace_memory: bool = True,
+        ) -> None:
+
+        self.profile_folder = profile_folder
+        self.trace_memory = trace_memory
+        self.stages: dict[str, dict] = {}
+
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the wall time and peak memory of the enclosed stage."""
+
+        profile = Profile() if self.profile_folder is not None else None
+        if self.trace_memory:
+            start_tracing()
+        start = perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            duration = perf_counter() - start
+            peak = None
+            if self.trace_memory:
+                _, peak = get_traced_memory()
+                stop_tracing()
+
+            self.stages[name] = {
+                'wall_time': round(duration, 6),
+                'peak_memory': peak,
+            }
+            if profile is not None:
+                self.profile_folder.mkdir(parents=True, exist_ok=True)
+                profile.dump_stats(self.profile_folder / f'{name}.prof')
+
+
+def run_benchmark(
+        blueprint_folder: Path,
+        benchmark: Benchmark,
+        image_count: int,
+    ) -> None:
+    """
+    Run each stage of the build against the given Blueprints.
+
+    Args:
+        blueprint_folder: Root folder of all Blueprints. This must be
+            the blueprints folder of a (generated) repository root, as
+            the full build writes its outputs into the parent folder.
+        benchmark: Benchmark to time each stage with.
+        image_count: Number of preview images to normalize.
+    """
+
+    with benchmark.stage('glob'):
+        files = sorted(blueprint_folder.glob('*/*/*/blueprint.json'))
+
+    with benchmark.stage('json_parse'):
+        blueprints = [(file, loads(file.read_bytes())) for file in files]
+
+    with benchmark.stage('validation'):
+        report = validate_blueprints(files, use_cache=False)
+    if not report.passed:
+        raise ValueError(f'Synthetic Blueprints are invalid: {report.format()}')
+
+    with benchmark.stage('series_aggregation'):
+        series_maps: dict[Path, dict[int, dict]] = {}
+        for file, blueprint in blueprints:
+            series_maps.setdefault(file.parent.parent, {})[int(file.parent.name)] = blueprint
+        series_blueprints = {
+            series_subfolder: build_series_blueprints(blueprint_map)
+            for series_subfolder, blueprint_map in series_maps.items()
+        }
+        series_json = {
+            series_subfolder: format_json(blueprint_list)
+            for series_subfolder, blueprint_list in series_blueprints.items()
+        }
+
+    with benchmark.stage('master_aggregation'):
+        all_blueprints = []
+        for series_subfolder, blueprint_list in series_blueprints.items():
+            all_blueprints.extend(build_master_entries(series_subfolder, blueprint_list))
+        master_json = format_json(all_blueprints)
+
+    with benchmark.stage('statistics'):
+        statistics = StatisticsCache(None)
+        for file, blueprint in blueprints:
+            statistics.update(
+                file.parent.relative_to(blueprint_folder).as_posix(),
+                file.parent.parent.name,
+                int(file.parent.name),
+                blueprint,
+            )
+
+    with benchmark.stage('readme_rendering'):
+        for series_subfolder, blueprint_list in series_blueprints.items():
+            series_key = series_subfolder.relative_to(blueprint_folder).as_posix()
+            build_series_readme(
+                series_subfolder.name,
+                [
+                    None if blueprint is None
+                    else statistics.get_summary(f'{series_key}/{blueprint_id}')
+                    for blueprint_id, blueprint in enumerate(blueprint_list)
+                ],
+            )
+        build_master_readme(statistics)
+
+    # Only the generated (non-placeholder) previews can be normalized
+    previews = [
+        preview for file, blueprint in blueprints
+        if (preview := file.parent / blueprint['preview']).stat().st_size
+    ][:image_count]
+    with benchmark.stage('image_normalization'):
+        for preview in previews:
+            normalize_preview(preview)
+
+    # Time the build which is actually run, first in full, then again
+    # incrementally (when nothing has changed)
+    with benchmark.stage('build_all_full'):
+        build_all(full=True, root=blueprint_folder.parent)
+    with benchmark.stage('build_all_incremental'):
+        build_all(root=blueprint_folder.parent)
+
+    benchmark.stages['series_aggregation']['output_bytes'] = sum(map(len, series_json.values()))
+    benchmark.stages['master_aggregation']['output_bytes'] = len(master_json)
+
+
+# File is entrypoint
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Benchmark the Blueprint build')
+    parser.add_argument(
+        '--blueprints',
+        type=int,
+        default=1000,
+        help='Number of synthetic Blueprints to generate',
+    )
+    parser.add_argument(
+        '--images',
+        type=int,
+        default=20,
+        help='Number of preview images to generate and normalize',
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+        help='Seed used to generate the synthetic Blueprints',
+    )
+    parser.add_argument(
+        '--output',
+        type=Path,
+        default=None,
+        help='File to write the JSON results to (instead of stdout)',
+    )
+    parser.add_argument(
+        '--profile',
+        type=Path,
+        default=None,
+        metavar='FOLDER',
+        help='Folder to write cProfile stats of each stage into',
+    )
+    parser.add_argument(
+        '--no-trace-memory',
+        action='store_false',
+        dest='trace_memory',
+        help='Do not measure peak memory (for more accurate timings)',
+    )
+    args = parser.parse_args()
+
+    with TemporaryDirectory(prefix='blueprint-benchmark-') as temp_directory:
+        blueprint_folder = Path(temp_directory) / 'blueprints'
+        start = perf_counter()
+        generate_tree(blueprint_folder, args.blueprints, args.images, args.seed)
+        generation_time = perf_counter() - start
+
+        benchmark = Benchmark(args.profile, args.trace_memory)
+        run_benchmark(blueprint_folder, benchmark, args.images)
+
+    results = dumps({
+        'python': python_version(),
+        'blueprints': args.blueprints,
+        'images': min(args.images, args.blueprints),
+        'seed': args.seed,
+        'generation_time': round(generation_time, 6),
+        'stages': benchmark.stages,
+        'total_wall_time': round(
+            sum(stage['wall_time'] for stage in benchmark.stages.values()), 6
+        ),
+    }, indent=2)
+
+    if args.output is None:
+        print(results)
+    else:
+        args.output.write_text(results)
@@ -0,0 +1,238 @@
+"""
+Persistent cache of per-Blueprint summary rows and aggregate statistics.
+
+Each Blueprint is stored as a summary row keyed by its folder (e.g.
+`B/Bluey (2018)/0`), the same key as the build manifest - which records
+the digest of each Blueprint, and so determines which rows must be
+updated. Aggregate counts (per Series, creator, card type, month
+created, and font) are kept alongside the rows and adjusted as rows are
+added, updated, or removed - so the cache can be updated incrementally
+as Blueprints change, and the READMEs (or any dashboard) can be rendered
+from it without reading any Blueprints.
+"""
+
+from dataclasses import asdict, fields
+from json import JSONDecodeError
+from pathlib import Path
+from typing import Optional
+
+from build.utils import ROOT, format_json, get_letter, loads, write_if_changed
+from models.summary import BlueprintSummary
+
+
+STATISTICS_CACHE = ROOT / 'blueprint_statistics.json'
+STATISTICS_VERSION = 1
+AGGREGATES = ('series', 'creators', 'card_types', 'months', 'fonts')
+
+_SUMMARY_FIELDS = tuple(field.name for field in fields(BlueprintSummary))
+
+
+def get_row_aggregates(row: dict) -> dict[str, list[str]]:
+    """Get the aggregate keys the given summary row contributes to."""
+
+    return {
+        'series': [row['series_full_name']],
+        'creators': [creator.strip() for creator in row['creator'].split(',')],
+        'card_types': [row['card_type']] if row['card_type'] else [],
+        # Dates are formatted as YYYY-MM-DDTHH:MM:SS
+        'months': [row['created'][:7]] if row['created'] else [],
+        'fonts': sorted(set(row['fonts'])),
+    }
+
+
+def get_master_key(blueprint: dict) -> str:
+    """Get the row key of the given master Blueprint entry."""
+
+    return f'{get_letter(blueprint)}/{blueprint["series_full_name"]}/{blueprint["id"]}'
+
+
+class StatisticsCache:
+    """
+    Summary rows and aggregate statistics of all Blueprints. If `file`
+    is None, the cache is kept in memory only.
+    """
+
+    def __init__(self, file: Optional[Path] = STATISTICS_CACHE) -> None:
+        self.file = file
+        self.rows: dict[str, dict] = {}
+        self.aggregates: dict[str, dict[str, int]] = {
+            aggregate: {} for aggregate in AGGREGATES
+        }
+        self.changed = False
+
+        if file is None:
+            return
+
+        try:
+            content = loads(file.read_bytes())
+        except (FileNotFoundError, JSONDecodeError):
+            return
+
+        if content.get('version') == STATISTICS_VERSION:
+            self.rows = content['rows']
+            self.aggregates = content['aggregates']
+
+
+    def _adjust(self, row: dict, change: int) -> None:
+        """Add (or subtract) the given row from all aggregates."""
+
+        for aggregate, keys in get_row_aggregates(row).items():
+            counts = self.aggregates[aggregate]
+            for key in keys:
+                if (count := counts.get(key, 0) + change) > 0:
+                    counts[key] = count
+                else:
+                    counts.pop(key, None)
+
+
+    def update(self,
+            key: str,
+            series_full_name: str,
+            blueprint_id: int,
+            blueprint: dict,
+        ) -> bool:
+        """
+        Update the row of the given Blueprint.
+
+        Args:
+            key: Key of the Blueprint (its folder, relative to the
+                blueprints folder).
+            series_full_name: Full name of the Blueprint's Series.
+            blueprint_id: ID of the Blueprint.
+            blueprint: Parsed Blueprint.
+
+        Returns:
+            Whether the row was changed.
+        """
+
+        summary = BlueprintSummary.from_blueprint(
+            series_full_name, blueprint_id, blueprint
+        )
+        row = asdict(summary) | {
+            'fonts': [
+                font['name'] for font in blueprint.get('fonts', [])
+                if font.get('name')
+            ],
+        }
+        if self.rows.get(key) == row:
+            return False
+
+        self.remove(key)
+        self.rows[key] = row
+        self._adjust(row, 1)
+        self.changed = True
+
+        return True
+
+
+    def update_from_master(self, blueprint: dict) -> bool:
+        """Update the row of the given master Blueprint entry."""
+
+        series_full_name, blueprint_id = blueprint['series_full_name'], blueprint['id']
+
+        return self.update(
+            get_master_key(blueprint),
+            series_full_name,
+            blueprint_id,
+            # Master previews are full URLs, only store the filename
+            blueprint | {'preview': blueprint['preview'].rsplit('/', 1)[-1]},
+        )
+
+
+    def refresh_from_master(self, all_blueprints: list[dict]) -> bool:
+        """
+        Update the rows of all the given master Blueprint entries, and
+        remove the rows of any Blueprints not among them.
+
+        Returns:
+            Whether any row was changed.
+        """
+
+        changed = False
+        for blueprint in all_blueprints:
+            changed |= self.update_from_master(blueprint)
+        for key in set(self.rows) - set(map(get_master_key, all_blueprints)):
+            changed |= self.remove(key)
+
+        return changed
+
+
+    def remove(self, key: str) -> bool:
+        """
+        Remove the row of the given Blueprint.
+
+        Returns:
+            Whether a row was removed.
+        """
+
+        if (row := self.rows.pop(key, None)) is None:
+            return False
+
+        self._adjust(row, -1)
+        self.changed = True
+
+        return True
+
+
+    def get_summary(self, key: str) -> Optional[BlueprintSummary]:
+        """Get the summary of the Blueprint with the given key."""
+
+        if (row := self.rows.get(key)) is None:
+            return None
+
+        return BlueprintSummary(**{field: row[field] for field in _SUMMARY_FIELDS})
+
+
+    @property
+    def blueprint_count(self) -> int:
+        return len(self.rows)
+
+
+    def count(self, aggregate: str) -> int:
+        """Get the number of unique keys of the given aggregate."""
+
+        return len(self.aggregates[aggregate])
+
+
+    def leaderboard(self,
+            aggregate: str,
+            top_n: Optional[int] = None,
+        ) -> list[tuple[str, int]]:
+        """
+        Get the keys of the given aggregate with the most Blueprints.
+
+        Args:
+            aggregate: Name of the aggregate (one of `AGGREGATES`).
+            top_n: Number of keys to return. If omitted, all keys are
+                returned.
+
+        Returns:
+            List of keys and their Blueprint counts, sorted by count (and
+            then key).
+        """
+
+        return sorted(
+            self.aggregates[aggregate].items(),
+            key=lambda item: (-item[1], item[0]),
+        )[:top_n]
+
+
+    def save(self) -> bool:
+        """
+        Write this cache to file, if it has changed.
+
+        Returns:
+            Whether the file was written.
+        """
+
+        if self.file is None or not self.changed:
+            return False
+
+        return write_if_changed(self.file, format_json({
+            'version': STATISTICS_VERSION,
+            'rows': dict(sorted(self.rows.items())),
+            'aggregates': {
+                aggregate: dict(sorted(counts.items()))
+                for aggregate, counts in self.aggregates.items()
+            },
+        }))
@@ -0,0 +1,273 @@
+"""
+Python script to be called by a GitHub action.
+
+This script runs the entire Blueprint build in a single pass over the
+blueprints folder. It lints all blueprint.json files, builds the Series
+blueprints.json and README files, and then builds the master blueprint
+and README files, and the compact Blueprint catalog and search index.
+The READMEs are rendered from the Blueprint statistics cache, which is
+only updated with the Blueprints which have changed.
+
+A manifest of the content hash of each Blueprint is kept so that only
+the Blueprints (and Series) which have changed since the last build are
+re-linted and re-built. All outputs are only written if their content
+has changed.
+"""
+
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Optional
+
+from build.blueprint_statistics import STATISTICS_CACHE, StatisticsCache
+from build.build_catalog import build_catalog, is_catalog_complete
+from build.build_master_blueprint import build_master_entries, write_master_blueprint
+from build.build_master_readme import DEFAULT_TOP_N, build_master_readme
+from build.build_series_blueprints import build_series_blueprints, write_series_blueprints
+from build.build_series_readme import build_series_readme
+from build.lint_blueprints import lint_blueprint
+from build.font_store import build_font_store
+from build.manifest import FILE_CACHE, MANIFEST_FILE, BuildManifest
+from build.search_index import SEARCH_INDEX, write_search_index
+from build.utils import (
+    BLUEPRINT_FOLDER, CATALOG_FOLDER, MASTER_BLUEPRINT, MASTER_README, ROOT,
+    get_digest, read_json, write_if_changed,
+)
+
+
+def get_series_folders(
+        blueprint_folder: Path = BLUEPRINT_FOLDER,
+    ) -> dict[Path, list[Path]]:
+    """
+    Walk the blueprints folder a single time and find all Series and
+    their blueprint.json files.
+
+    Args:
+        blueprint_folder: Root folder of all Blueprints.
+
+    Returns:
+        Dictionary of Series subfolders (in sorted order) to the list of
+        blueprint.json files within that Series.
+    """
+
+    series_folders: dict[Path, list[Path]] = {}
+    for letter_subfolder in sorted(blueprint_folder.iterdir()):
+        if not letter_subfolder.is_dir():
+            continue
+
+        for series_subfolder in sorted(letter_subfolder.iterdir()):
+            if not series_subfolder.is_dir():
+                continue
+
+            series_folders[series_subfolder] = sorted(
+                series_subfolder.glob('*/blueprint.json'),
+                key=lambda file: int(file.parent.name)
+                    if file.parent.name.isdigit() else -1,
+            )
+
+    return series_folders
+
+
+def rebase(path: Path, root: Path) -> Path:
+    """Get the given repository path within another repository root."""
+
+    return root / path.relative_to(ROOT)
+
+
+def build_all(
+        full: bool = False,
+        top_n: int = DEFAULT_TOP_N,
+        root: Path = ROOT,
+    ) -> dict[str, int]:
+    """
+    Run the incremental build.
+
+    Args:
+        full: Whether to ignore the manifest and rebuild everything.
+        top_n: Number of Series and creators to list in the master
+            README.
+        root: Root folder of the repository to build. Only changed to
+            build a copy of the repository (e.g. when benchmarking).
+
+    Returns:
+        Dictionary of statistics about the build.
+    """
+
+    blueprint_folder = rebase(BLUEPRINT_FOLDER, root)
+    master_file = rebase(MASTER_BLUEPRINT, root)
+    catalog_folder = rebase(CATALOG_FOLDER, root)
+    search_index = rebase(SEARCH_INDEX, root)
+    manifest = BuildManifest(
+        rebase(MANIFEST_FILE, root), rebase(FILE_CACHE, root), blueprint_folder,
+    )
+    statistics = StatisticsCache(rebase(STATISTICS_CACHE, root))
+    stats = {
+        'blueprints': 0, 'linted': 0, 'series': 0, 'series_built': 0,
+        'files_written': 0,
+    }
+
+    # Walk all Series, determine which Blueprints have changed
+    series_folders = get_series_folders(blueprint_folder)
+    changed_blueprints: dict[Path, Optional[dict]] = {}
+    dirty_series: set[Path] = set()
+    fonts_changed = False
+    for series_subfolder, blueprint_files in series_folders.items():
+        for blueprint_file in blueprint_files:
+            stats['blueprints'] += 1
+            previous_digest = manifest.get_previous_digest(blueprint_file)
+            digest = manifest.hash_file(blueprint_file)
+            if full or digest != previous_digest:
+                # Blueprint has changed, lint it
+                changed_blueprints[blueprint_file] = lint_blueprint(blueprint_file)
+                digest = get_digest(blueprint_file.read_bytes())
+                dirty_series.add(series_subfolder)
+                stats['linted'] += 1
+
+            # Font store must be rebuilt if any Font files have changed
+            fonts = manifest.hash_fonts(blueprint_file)
+            if fonts != manifest.get_previous_fonts(blueprint_file):
+                fonts_changed = True
+            manifest.record(blueprint_file, digest, fonts)
+
+            # Update the statistics of any changed (or uncached) Blueprint
+            key = manifest.get_key(blueprint_file)
+            if blueprint_file in changed_blueprints or key not in statistics.rows:
+                if blueprint_file in changed_blueprints:
+                    blueprint = changed_blueprints[blueprint_file]
+                else:
+                    blueprint = read_json(blueprint_file)
+                if blueprint is None:
+                    statistics.remove(key)
+                else:
+                    statistics.update(
+                        key, series_subfolder.name,
+                        int(blueprint_file.parent.name), blueprint,
+                    )
+
+        # Rebuild Series whose outputs are missing
+        if (not (series_subfolder / 'blueprints.json').exists()
+            or not (series_subfolder / 'README.md').exists()):
+            dirty_series.add(series_subfolder)
+
+    # Remove the statistics of all deleted Blueprints
+    for key in set(statistics.rows) - set(manifest.entries):
+        statistics.remove(key)
+
+    # Rebuild Series which had any Blueprints deleted
+    for key in manifest.removed:
+        if (series_subfolder := (blueprint_folder / key).parent) in series_folders:
+            dirty_series.add(series_subfolder)
+
+    # Read existing master file; rebuild any Series not present in it
+    master = None
+    if not full and master_file.exists():
+        master = read_json(master_file)
+    existing_entries: dict[str, list[dict]] = {}
+    for entry in (master or []):
+        existing_entries.setdefault(entry['series_full_name'], []).append(entry)
+    dirty_series |= {
+        series_subfolder for series_subfolder in series_folders
+        if series_subfolder.name not in existing_entries
+    }
+    stats['series'] = len(series_folders)
+
+    # Rebuild the Series files for all modified Series
+    master_entries: dict[Path, list[dict]] = {}
+    for series_subfolder in dirty_series:
+        blueprint_map = {}
+        for blueprint_file in series_folders[series_subfolder]:
+            if blueprint_file in changed_blueprints:
+                blueprint = changed_blueprints[blueprint_file]
+            else:
+                blueprint = read_json(blueprint_file)
+            if blueprint is not None:
+                blueprint_map[int(blueprint_file.parent.name)] = blueprint
+
+        blueprint_list = build_series_blueprints(blueprint_map)
+        series_key = series_subfolder.relative_to(blueprint_folder).as_posix()
+        stats['files_written'] += write_series_blueprints(
+            series_subfolder, blueprint_list
+        )
+        stats['files_written'] += write_if_changed(
+            series_subfolder / 'README.md',
+            build_series_readme(
+                series_subfolder.name,
+                [
+                    None if blueprint is None
+                    else statistics.get_summary(f'{series_key}/{blueprint_id}')
+                    for blueprint_id, blueprint in enumerate(blueprint_list)
+                ],
+            ),
+        )
+        master_entries[series_subfolder] = build_master_entries(
+            series_subfolder, blueprint_list
+        )
+        stats['series_built'] += 1
+
+    # Rebuild master files if any Series were added, modified, or removed
+    removed_series = set(existing_entries) - {
+        series_subfolder.name for series_subfolder in series_folders
+    }
+    # Catalog must also be rebuilt if any Font (or the catalog) changed
+    rebuild_catalog = (
+        fonts_changed
+        or not is_catalog_complete(catalog_folder)
+        or not search_index.exists()
+    )
+    if master is None or dirty_series or removed_series or rebuild_catalog:
+        all_blueprints = []
+        for series_subfolder in series_folders:
+            if series_subfolder in master_entries:
+                all_blueprints.extend(master_entries[series_subfolder])
+            else:
+                all_blueprints.extend(
+                    existing_entries.get(series_subfolder.name, [])
+                )
+
+        master_written = write_master_blueprint(all_blueprints, master_file)
+        stats['files_written'] += master_written
+        if master_written or full or rebuild_catalog:
+            stats['files_written'] += build_catalog(
+                all_blueprints,
+                # Reuse the Font digests already recorded by the manifest
+                build_font_store(
+                    all_blueprints, blueprint_folder, manifest.file_cache.files,
+                ),
+                catalog_folder,
+            )
+            stats['files_written'] += write_search_index(
+                all_blueprints, search_index
+            )
+
+    # Master README is rendered from the statistics alone
+    stats['files_written'] += write_if_changed(
+        rebase(MASTER_README, root), build_master_readme(statistics, top_n)
+    )
+
+    stats['files_written'] += statistics.save()
+    stats['files_written'] += manifest.save(force=full)
+
+    return stats
+
+
+# File is entrypoint
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Build all Blueprint files')
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Ignore the build manifest and rebuild all Blueprints',
+    )
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=DEFAULT_TOP_N,
+        help='Number of Series and creators to list in the master README',
+    )
+    args = parser.parse_args()
+
+    stats = build_all(full=args.full, top_n=args.top)
+    print(
+        f'Linted {stats["linted"]}/{stats["blueprints"]} Blueprints, built '
+        f'{stats["series_built"]}/{stats["series"]} Series, wrote '
+        f'{stats["files_written"]} files'
+    )
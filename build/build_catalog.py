@@ -0,0 +1,172 @@
+"""
+Python script to be called by a GitHub action.
+
+This script reads the master blueprint file and writes a compact catalog
+of all Blueprints which clients can download piecemeal. The catalog
+consists of:
+
+- A minified (and pre-gzipped) copy of the master blueprint file.
+- Per-letter shards (matching the blueprints/<letter>/ layout) which
+  contain the full Blueprints for all Series of that letter.
+- A content-addressed manifest of all unique Font files (see
+  `font_store.py`), so shared Fonts are only downloaded once.
+- A small index of each Series' shard and a summary of its Blueprints
+  (including the hash of each of its Fonts).
+
+Every file in the catalog is versioned with a content hash so clients
+can skip re-downloading anything which has not changed.
+"""
+
+from gzip import compress
+from pathlib import Path
+from sys import exit as sys_exit
+from typing import Optional
+
+from build.font_store import build_font_store, get_font_hashes
+from build.utils import (
+    CATALOG_FOLDER, MASTER_BLUEPRINT, get_digest, get_letter, minify_json,
+    read_json, write_if_changed,
+)
+
+
+CATALOG_VERSION = 1
+
+
+def get_version(content: bytes) -> str:
+    """Get the ETag-style version of the given file content."""
+
+    return get_digest(content)[:16]
+
+
+def write_with_gzip(file: Path, content: bytes) -> int:
+    """
+    Write the given content to the file and a gzipped copy of the file.
+
+    Args:
+        file: Path to write the uncompressed content to.
+        content: Content to write.
+
+    Returns:
+        Number of files written.
+    """
+
+    return (
+        write_if_changed(file, content)
+        # mtime is fixed so the compressed output is deterministic
+        + write_if_changed(
+            file.with_name(f'{file.name}.gz'),
+            compress(content, compresslevel=9, mtime=0),
+        )
+    )
+
+
+def is_catalog_complete(catalog_folder: Path = CATALOG_FOLDER) -> bool:
+    """
+    Whether every file of the catalog (including each shard listed in
+    its index, and every gzipped copy) exists, and the index parses.
+
+    Args:
+        catalog_folder: Folder the catalog was written into.
+
+    Returns:
+        Whether the catalog is complete.
+    """
+
+    if (not (index_file := catalog_folder / 'index.json').exists()
+        or not isinstance(index := read_json(index_file), dict)
+        or not isinstance(index.get('shards'), dict)):
+        return False
+
+    files = [
+        catalog_folder / 'master_blueprints.json',
+        catalog_folder / 'fonts.json',
+        index_file,
+        *(catalog_folder / 'shards' / f'{letter}.json' for letter in index['shards']),
+    ]
+
+    return all(
+        file.exists() and file.with_name(f'{file.name}.gz').exists()
+        for file in files
+    )
+
+
+def build_catalog(
+        all_blueprints: list[dict],
+        font_store: Optional[dict] = None,
+        catalog_folder: Path = CATALOG_FOLDER,
+    ) -> int:
+    """
+    Write the compact catalog for the given master Blueprints.
+
+    Args:
+        all_blueprints: List of all master Blueprint entries.
+        font_store: Font store of the Blueprints. If omitted, the font
+            store is built.
+        catalog_folder: Folder to write the catalog into.
+
+    Returns:
+        Number of files written.
+    """
+
+    written = 0
+
+    # Minified master file
+    master = minify_json(all_blueprints)
+    written += write_with_gzip(catalog_folder / 'master_blueprints.json', master)
+
+    # Font store
+    if font_store is None:
+        font_store = build_font_store(all_blueprints)
+    fonts = minify_json(font_store)
+    written += write_with_gzip(catalog_folder / 'fonts.json', fonts)
+
+    # Group Blueprints into letter shards, and summarize each Series
+    shards: dict[str, list[dict]] = {}
+    series: dict[str, dict] = {}
+    for blueprint in all_blueprints:
+        letter = get_letter(blueprint)
+        shards.setdefault(letter, []).append(blueprint)
+        series.setdefault(
+            blueprint['series_full_name'], {'shard': letter, 'blueprints': []}
+        )['blueprints'].append({
+            'id': blueprint['id'],
+            'creator': blueprint['creator'],
+            'created': blueprint['created'],
+            'preview': blueprint['preview'],
+            'fonts': get_font_hashes(font_store, blueprint),
+        })
+
+    # Write shards, removing any which no longer exist
+    shard_folder = catalog_folder / 'shards'
+    shard_versions = {}
+    for letter, blueprints in sorted(shards.items()):
+        content = minify_json(blueprints)
+        shard_versions[letter] = get_version(content)
+        written += write_with_gzip(shard_folder / f'{letter}.json', content)
+    if shard_folder.exists():
+        for file in shard_folder.glob('*.json*'):
+            if file.name.split('.', 1)[0] not in shards:
+                file.unlink()
+                written += 1
+
+    # Write index
+    index = minify_json({
+        'version': get_version(master),
+        'catalog_version': CATALOG_VERSION,
+        'blueprint_count': len(all_blueprints),
+        'shards': shard_versions,
+        'fonts': get_version(fonts),
+        'series': series,
+    })
+    written += write_with_gzip(catalog_folder / 'index.json', index)
+
+    return written
+
+
+# File is entrypoint
+if __name__ == '__main__':
+    # Parse Master Blueprint, exit if unable to parse
+    if (all_blueprints := read_json(MASTER_BLUEPRINT)) is None:
+        sys_exit(1)
+
+    build_catalog(all_blueprints)
@@ -6,52 +6,86 @@ blueprint.json file that can be parsed for purposes of browsing
 blueprints.
 """
 
-from json import dump as json_dump, load as json_load, JSONDecodeError
 from pathlib import Path
+from typing import Optional
 
+from build.utils import (
+    BLUEPRINT_FOLDER, MASTER_BLUEPRINT, REPO_URL, format_json, read_json,
+    write_if_changed,
+)
 
-BLUEPRINT_FOLDER = Path(__file__).parent.parent / 'blueprints'
-MASTER_BLUEPRINT = Path(__file__).parent.parent / 'master_blueprints.json'
 
-REPO_URL = (
-    'https://github.com/CollinHeist/TitleCardMaker-Blueprints/'
-    'raw/master/blueprints'
-)
+def build_master_entries(
+        series_subfolder: Path,
+        blueprint_list: list[Optional[dict]],
+    ) -> list[dict]:
+    """
+    Create the master blueprint entries for all Blueprints of a single
+    Series.
 
+    Args:
+        series_subfolder: Series folder the Blueprints are from.
+        blueprint_list: List of the Series Blueprints (as written in the
+            Series blueprints.json file).
+
+    Returns:
+        List of Blueprints with the Series name and Blueprint ID added,
+        and the preview updated to a fully resolved link.
+    """
 
-all_blueprints = []
-for blueprint_file in BLUEPRINT_FOLDER.glob('*/*/blueprints.json'):
-    series_subfolder = blueprint_file.parent
     letter_subfolder = series_subfolder.parent
-    series_full_name = series_subfolder.name
 
-    # Read this blueprint file
-    with blueprint_file.open('r') as file_handle:
-        # Parse JSON, skip if unable to parse
-        try:
-            blueprint_json = json_load(file_handle)
-        except JSONDecodeError:
+    entries = []
+    for blueprint_id, blueprint in enumerate(blueprint_list):
+        # Skip null blueprints
+        if blueprint is None:
             continue
 
-        # Go through all blueprints in this file
-        for blueprint_id, blueprint in enumerate(blueprint_json):
-            # Skip null blueprints
-            if blueprint is None:
-                continue
+        # Add Series name and blueprint ID
+        entry = dict(blueprint)
+        entry['series_full_name'] = series_subfolder.name
+        entry['id'] = blueprint_id
+
+        # Update preview to be fully resolved link
+        entry['preview'] = (
+            f'{REPO_URL}/{letter_subfolder.name}/{series_subfolder.name}/'
+            f'{blueprint_id}/{blueprint["preview"]}'
+        )
+
+        entries.append(entry)
+
+    return entries
 
-            # Add Series name and blueprint ID
-            blueprint['series_full_name'] = series_full_name
-            blueprint['id'] = blueprint_id
 
-            # Update preview to be fully resolved link
-            blueprint['preview'] = (
-                f'{REPO_URL}/{letter_subfolder.name}/{series_subfolder.name}/'
-                f'{blueprint_id}/{blueprint["preview"]}'
-            )
+def write_master_blueprint(
+        all_blueprints: list[dict],
+        file: Path = MASTER_BLUEPRINT,
+    ) -> bool:
+    """
+    Write the given list of Blueprints to the master blueprint file.
+
+    Args:
+        all_blueprints: List of all master Blueprint entries.
+        file: Path to the master blueprint file.
+
+    Returns:
+        Whether the file was written.
+    """
+
+    return write_if_changed(file, format_json(all_blueprints))
+
+
+# File is entrypoint
+if __name__ == '__main__':
+    all_blueprints = []
+    for blueprint_file in sorted(BLUEPRINT_FOLDER.glob('*/*/blueprints.json')):
+        # Parse JSON, skip if unable to parse
+        if (blueprint_json := read_json(blueprint_file)) is None:
+            continue
 
-            # Add to master list
-            all_blueprints.append(blueprint)
+        all_blueprints.extend(
+            build_master_entries(blueprint_file.parent, blueprint_json)
+        )
 
-# Write updated master list
-with MASTER_BLUEPRINT.open('w') as file_handle:
-    json_dump(all_blueprints, file_handle, indent=2)
+    # Write updated master list
+    write_master_blueprint(all_blueprints)
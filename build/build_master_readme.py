@@ -1,12 +1,17 @@
 """
 Python script to be called by a GitHub action.
 
-This script reads all Series blueprints.json files and writes summary
-README's within each Series subfolder.
+This script renders the summary README at the root of the repository
+from the Blueprint statistics cache. The cache is first refreshed from
+the master blueprint file (which only updates the rows of Blueprints
+which have changed).
 """
 
-from json import load as json_load, JSONDecodeError
-from pathlib import Path
+from argparse import ArgumentParser
+from sys import exit as sys_exit
+
+from build.blueprint_statistics import StatisticsCache
+from build.utils import MASTER_BLUEPRINT, MASTER_README, read_json, write_if_changed
 
 README_TEMPLATE = """# TitleCardMaker Blueprints
 
@@ -19,74 +24,72 @@ There are currently `{blueprint_count}` Blueprints available for `{series_count}
 Series with the most Blueprints:
 | Series | Blueprints |
 | :--- | :--- |
-| {series_name0} | {series_bp_count0} |
-| {series_name1} | {series_bp_count1} |
-| {series_name2} | {series_bp_count2} |
-| {series_name3} | {series_bp_count3} |
-| {series_name4} | {series_bp_count4} |
+{series_rows}
 
 Creators with the most Blueprint Submissions:
 | Username | Blueprints |
 | :---: | :--- |
-| {username0} | {username_bp_count0} |
-| {username1} | {username_bp_count1} |
-| {username2} | {username_bp_count2} |
-| {username3} | {username_bp_count3} |
-| {username4} | {username_bp_count4} |
+{creator_rows}
 """
 
-# Parse Master Blueprint
-with (Path(__file__).parent.parent / 'master_blueprints.json').open('r') as fh:
-    # Parse JSON, skip if unable to parse
-    try:
-        blueprints = json_load(fh)
-    except JSONDecodeError:
-        exit(1)
-
-# Get top Series
-series_data: dict[str, int] = {}
-for blueprint in blueprints:
-    if blueprint['series_full_name'] in series_data:
-        series_data[blueprint['series_full_name']] += 1
-    else:
-        series_data[blueprint['series_full_name']] = 1
-top_series = sorted(series_data.items(), key=lambda item: item[1], reverse=True)
-
-# Get top usernames
-user_data: dict[str, int] = {}
-for blueprint in blueprints:
-    creators = map(str.strip, blueprint['creator'].split(','))
-    for creator in creators:
-        if creator in user_data:
-            user_data[creator] += 1
-        else:
-            user_data[creator] = 1
-top_users = sorted(user_data.items(), key=lambda item: item[1], reverse=True)
-
-def get_nth_user(n: int) -> tuple[str, str]:
-    try:
-        return top_users[n]
-    except IndexError:
-        return '-', '-'
-
-# Generate counts
-data = {
-    'blueprint_count': len(blueprints),
-    'series_count': len(set(bp['series_full_name'] for bp in blueprints)),
-    'creator_count': len(set(bp['creator'] for bp in blueprints)),
-    'series_name0': top_series[0][0], 'series_bp_count0': top_series[0][1],
-    'series_name1': top_series[1][0], 'series_bp_count1': top_series[1][1],
-    'series_name2': top_series[2][0], 'series_bp_count2': top_series[2][1],
-    'series_name3': top_series[3][0], 'series_bp_count3': top_series[3][1],
-    'series_name4': top_series[4][0], 'series_bp_count4': top_series[4][1],
-    'username0': get_nth_user(0)[0], 'username_bp_count0': get_nth_user(0)[1],
-    'username1': get_nth_user(1)[0], 'username_bp_count1': get_nth_user(1)[1],
-    'username2': get_nth_user(2)[0], 'username_bp_count2': get_nth_user(2)[1],
-    'username3': get_nth_user(3)[0], 'username_bp_count3': get_nth_user(3)[1],
-    'username4': get_nth_user(4)[0], 'username_bp_count4': get_nth_user(4)[1],
-}
-
-# Write README file
-readme = README_TEMPLATE.format(**data)
-readme_file = Path(__file__).parent.parent / 'README.md'
-readme_file.write_text(readme)
+README_TABLE_ROW = '| {name} | {count} |'
+
+DEFAULT_TOP_N = 5
+
+
+def format_leaderboard(leaderboard: list[tuple[str, int]], top_n: int) -> str:
+    """Format the given leaderboard as table rows, padded to N rows."""
+
+    rows = leaderboard + [('-', '-')] * (top_n - len(leaderboard))
+
+    return '\n'.join(
+        README_TABLE_ROW.format(name=name, count=count) for name, count in rows
+    )
+
+
+def build_master_readme(
+        statistics: StatisticsCache,
+        top_n: int = DEFAULT_TOP_N,
+    ) -> str:
+    """
+    Generate the master README from the given statistics.
+
+    Args:
+        statistics: Statistics of all Blueprints.
+        top_n: Number of Series and creators to list.
+
+    Returns:
+        The README text.
+    """
+
+    return README_TEMPLATE.format(
+        blueprint_count=statistics.blueprint_count,
+        series_count=statistics.count('series'),
+        creator_count=statistics.count('creators'),
+        series_rows=format_leaderboard(statistics.leaderboard('series', top_n), top_n),
+        creator_rows=format_leaderboard(statistics.leaderboard('creators', top_n), top_n),
+    )
+
+
+# File is entrypoint
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Build the master README')
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=DEFAULT_TOP_N,
+        help='Number of Series and creators to list',
+    )
+    args = parser.parse_args()
+
+    # Parse Master Blueprint, exit if unable to parse
+    if (blueprints := read_json(MASTER_BLUEPRINT)) is None:
+        sys_exit(1)
+
+    # Refresh statistics from the Master Blueprint
+    statistics = StatisticsCache()
+    statistics.refresh_from_master(blueprints)
+    statistics.save()
+
+    # Write README file
+    write_if_changed(MASTER_README, build_master_readme(statistics, args.top))
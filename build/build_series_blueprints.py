@@ -6,46 +6,72 @@ series blueprints.json file that can be parsed when browsing Blueprints
 per-Series.
 """
 
-from json import dump as json_dump, load as json_load, JSONDecodeError
 from pathlib import Path
+from typing import Optional
 
+from build.utils import BLUEPRINT_FOLDER, format_json, read_json, write_if_changed
 
-BLUEPRINT_FOLDER = Path(__file__).parent.parent / 'blueprints'
 
-# Parse all Blueprints for all Series
-series_blueprints = {}
-for blueprint_file in BLUEPRINT_FOLDER.glob('*/*/*/blueprint.json'):
-    blueprint_id = int(blueprint_file.parent.name)
-    series_subfolder = blueprint_file.parent.parent
-    letter_subfolder = series_subfolder.parent
+def build_series_blueprints(
+        blueprint_map: dict[int, dict],
+    ) -> list[Optional[dict]]:
+    """
+    Create the list of Blueprints for a single Series.
 
-    # File to write all of this Series' blueprints to
-    series_blueprint_file = series_subfolder / 'blueprints.json'
+    Args:
+        blueprint_map: Map of Blueprint IDs to Blueprints.
 
-    # Read this blueprint file
-    with blueprint_file.open('r') as file_handle:
-        # Parse JSON, skip if unable to parse
-        try:
-            blueprint = json_load(file_handle)
-        except JSONDecodeError:
-            continue
+    Returns:
+        List of Blueprints sorted by their ID, with null put in place of
+        any missing IDs.
+    """
 
-        # Append Blueprint at it's ID
-        if series_blueprint_file in series_blueprints:
-            # Already an entry for this Series, just add to it
-            series_blueprints[series_blueprint_file][blueprint_id] = blueprint
-        else:
-            # Add entry for Series and this Blueprint
-            series_blueprints[series_blueprint_file] = {blueprint_id: blueprint}
-
-# Create blueprints.json files for all Series
-for series_blueprint_file, blueprint_map in series_blueprints.items():
-    # Create sorted list of Blueprints for this Series, putting null if DNE
-    blueprint_list = [
+    if not blueprint_map:
+        return []
+
+    return [
         blueprint_map.get(blueprint_id, None)
         for blueprint_id in range(max(blueprint_map.keys())+1)
     ]
 
-    # Write list to Series blueprints.json file
-    with series_blueprint_file.open('w') as file_handle:
-        json_dump(blueprint_list, file_handle, indent=2)
+
+def write_series_blueprints(
+        series_subfolder: Path,
+        blueprint_list: list[Optional[dict]],
+    ) -> bool:
+    """
+    Write the given list of Blueprints to the Series blueprints.json
+    file.
+
+    Args:
+        series_subfolder: Series folder to write the file within.
+        blueprint_list: List of Blueprints to write.
+
+    Returns:
+        Whether the file was written.
+    """
+
+    return write_if_changed(
+        series_subfolder / 'blueprints.json', format_json(blueprint_list)
+    )
+
+
+# File is entrypoint
+if __name__ == '__main__':
+    # Parse all Blueprints for all Series
+    series_blueprints: dict[Path, dict[int, dict]] = {}
+    for blueprint_file in BLUEPRINT_FOLDER.glob('*/*/*/blueprint.json'):
+        # Parse JSON, skip if unable to parse
+        if (blueprint := read_json(blueprint_file)) is None:
+            continue
+
+        # Append Blueprint at it's ID
+        series_blueprints.setdefault(blueprint_file.parent.parent, {})[
+            int(blueprint_file.parent.name)
+        ] = blueprint
+
+    # Create blueprints.json files for all Series
+    for series_subfolder, blueprint_map in series_blueprints.items():
+        write_series_blueprints(
+            series_subfolder, build_series_blueprints(blueprint_map)
+        )
@@ -5,8 +5,10 @@ This script reads all Series blueprints.json files and writes summary
 README's within each Series subfolder.
 """
 
-from json import load as json_load, JSONDecodeError
-from pathlib import Path
+from typing import Optional
+
+from build.utils import BLUEPRINT_FOLDER, read_json, write_if_changed
+from models.summary import BlueprintSummary, summarize_series
 
 README_TEMPLATE = """# {series_full_name}
 
@@ -21,38 +23,58 @@ README_TABLE_ROW = '| `{blueprint_id}` | <img src="./{blueprint_id}/{preview_fil
 def format_count(count: int) -> str:
     return f'`{count}`' if count else '-'
 
-# Parse all Blueprints for all Series
-BLUEPRINT_FOLDER = Path(__file__).parent.parent / 'blueprints'
-series_blueprints = {}
-for blueprint_file in BLUEPRINT_FOLDER.glob('*/*/blueprints.json'):
-    series_subfolder = blueprint_file.parent
 
-    # Read this Series blueprint file
-    with blueprint_file.open('r') as file_handle:
-        # Parse JSON, skip if unable to parse
-        try:
-            blueprints = json_load(file_handle)
-        except JSONDecodeError:
-            continue
+def build_series_readme(
+        series_full_name: str,
+        blueprints: list[Optional[BlueprintSummary]],
+    ) -> str:
+    """
+    Generate the README for a single Series.
+
+    Args:
+        series_full_name: Full name of the Series.
+        blueprints: List of the summaries of the Series Blueprints (in
+            the order of the Series blueprints.json file).
+
+    Returns:
+        The README text.
+    """
 
-    # Generate README for this Series
     readme = README_TEMPLATE.format(
-        series_full_name=series_subfolder.name,
+        series_full_name=series_full_name,
         count=len(blueprints),
     )
-    for blueprint_id, blueprint in enumerate(blueprints):
+    for blueprint in blueprints:
         if blueprint is None:
             continue
 
         readme += '\n' + README_TABLE_ROW.format(
-            blueprint_id=blueprint_id,
-            preview_file=blueprint['preview'],
-            template_count=format_count(len(blueprint.get('templates', []))),
-            font_count=format_count(len(blueprint.get('fonts', []))),
-            episode_count=format_count(len(blueprint.get('episodes', []))),
+            blueprint_id=blueprint.id,
+            preview_file=blueprint.preview,
+            template_count=format_count(blueprint.template_count),
+            font_count=format_count(blueprint.font_count),
+            episode_count=format_count(blueprint.episode_count),
         )
     # readme += README_FOOTER
 
-    # Write README file for this Series
-    readme_file = series_subfolder / 'README.md'
-    readme_file.write_text(readme)
+    return readme
+
+
+# File is entrypoint
+if __name__ == '__main__':
+    # Parse all Blueprints for all Series
+    for blueprint_file in BLUEPRINT_FOLDER.glob('*/*/blueprints.json'):
+        series_subfolder = blueprint_file.parent
+
+        # Parse JSON, skip if unable to parse
+        if (blueprints := read_json(blueprint_file)) is None:
+            continue
+
+        # Write README file for this Series
+        write_if_changed(
+            series_subfolder / 'README.md',
+            build_series_readme(
+                series_subfolder.name,
+                summarize_series(series_subfolder.name, blueprints),
+            ),
+        )
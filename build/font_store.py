@@ -0,0 +1,137 @@
+"""
+Python script to be called by a GitHub action.
+
+This script hashes every Font file of every Blueprint and writes a
+content-addressed manifest of all unique Fonts. Many Blueprints include
+the same Font files, so clients can use this manifest to download each
+unique Font a single time and cache it locally by its hash. The font
+store is also written as part of the catalog (see `build_catalog.py`).
+"""
+
+from pathlib import Path
+from sys import exit as sys_exit
+from typing import Optional
+
+from build.utils import (
+    BLUEPRINT_FOLDER, CATALOG_FOLDER, MASTER_BLUEPRINT, REPO_URL, get_digest,
+    get_letter, minify_json, read_json, write_if_changed,
+)
+
+
+FONT_STORE = CATALOG_FOLDER / 'fonts.json'
+
+
+def get_blueprint_key(blueprint: dict) -> str:
+    """Get the font store key of the given master Blueprint entry."""
+
+    return f'{blueprint["series_full_name"]}/{blueprint["id"]}'
+
+
+def build_font_store(
+        all_blueprints: list[dict],
+        blueprint_folder: Path = BLUEPRINT_FOLDER,
+        known_files: Optional[dict[str, dict]] = None,
+    ) -> dict:
+    """
+    Hash all Font files of the given master Blueprints.
+
+    Args:
+        all_blueprints: List of all master Blueprint entries.
+        blueprint_folder: Root folder of all Blueprints.
+        known_files: Already known `digest` and `size` of any files,
+            keyed by their path relative to the blueprints folder (as
+            recorded by the build manifest). Only Font files which are
+            not known are read and hashed.
+
+    Returns:
+        Dictionary of each unique Font (keyed by its digest) with the
+        canonical URL to download it from, and for each Blueprint, a
+        mapping of its Font files to their digests.
+    """
+
+    fonts: dict[str, dict] = {}
+    blueprints: dict[str, dict[str, str]] = {}
+    for blueprint in all_blueprints:
+        letter = get_letter(blueprint)
+        series_name, blueprint_id = blueprint['series_full_name'], blueprint['id']
+        subfolder = blueprint_folder / letter / series_name / str(blueprint_id)
+
+        font_digests = {}
+        for font in blueprint.get('fonts', []):
+            if (file := font.get('file')) is None or file in font_digests:
+                continue
+
+            key = f'{letter}/{series_name}/{blueprint_id}/{file}'
+            if (known := (known_files or {}).get(key)) is not None:
+                digest, size = known['digest'], known['size']
+            elif (font_file := subfolder / file).exists():
+                content = font_file.read_bytes()
+                digest, size = get_digest(content), len(content)
+            else:
+                continue
+            font_digests[file] = digest
+
+            # First occurrence of a Font is the canonical copy
+            if digest in fonts:
+                fonts[digest]['count'] += 1
+            else:
+                fonts[digest] = {
+                    'file': file,
+                    'url': f'{REPO_URL}/{letter}/{series_name}/{blueprint_id}/{file}',
+                    'size': size,
+                    'count': 1,
+                }
+
+        if font_digests:
+            blueprints[get_blueprint_key(blueprint)] = font_digests
+
+    return {
+        'fonts': fonts,
+        'blueprints': blueprints,
+        'total_files': sum(font['count'] for font in fonts.values()),
+        'total_size': sum(font['size'] * font['count'] for font in fonts.values()),
+        'unique_size': sum(font['size'] for font in fonts.values()),
+    }
+
+
+def get_font_hashes(
+        font_store: dict,
+        blueprint: dict,
+    ) -> list[Optional[str]]:
+    """
+    Get the digest of each Font of the given master Blueprint entry, in
+    the order the Fonts are defined. Fonts without a file are null.
+    """
+
+    font_digests = font_store['blueprints'].get(get_blueprint_key(blueprint), {})
+
+    return [
+        font_digests.get(font.get('file'))
+        for font in blueprint.get('fonts', [])
+    ]
+
+
+def write_font_store(font_store: dict, file: Path = FONT_STORE) -> bool:
+    """
+    Write the given font store.
+
+    Returns:
+        Whether the file was written.
+    """
+
+    return write_if_changed(file, minify_json(font_store))
+
+
+# File is entrypoint
+if __name__ == '__main__':
+    # Parse Master Blueprint, exit if unable to parse
+    if (all_blueprints := read_json(MASTER_BLUEPRINT)) is None:
+        sys_exit(1)
+
+    font_store = build_font_store(all_blueprints)
+    write_font_store(font_store)
+    print(
+        f'Found {len(font_store["fonts"])} unique Fonts across '
+        f'{font_store["total_files"]} Font files '
+        f'({font_store["unique_size"]:,} of {font_store["total_size"]:,} bytes)'
+    )
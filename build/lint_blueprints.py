@@ -5,22 +5,34 @@ This script "lints" all blueprint.json files to standardize the JSON
 across the project.
 """
 
-from json import dump as json_dump, load as json_load, JSONDecodeError
 from pathlib import Path
+from typing import Optional
 
+from build.utils import BLUEPRINT_FOLDER, format_json, read_json, write_if_changed
 
-BLUEPRINT_FOLDER = Path(__file__).parent.parent / 'blueprints'
 
-# Parse all Blueprints
-for blueprint_file in BLUEPRINT_FOLDER.glob('*/*/*/blueprint.json'):
-    # Read this blueprint file
-    with blueprint_file.open('r') as file_handle:
-        # Parse JSON, skip if unable to parse
-        try:
-            blueprint = json_load(file_handle)
-        except JSONDecodeError:
-            continue
+def lint_blueprint(blueprint_file: Path) -> Optional[dict]:
+    """
+    Rewrite the given blueprint file in the standard JSON format.
+
+    Args:
+        blueprint_file: Path to the blueprint.json file to lint.
+
+    Returns:
+        The parsed Blueprint, or None if the file could not be parsed.
+    """
+
+    # Parse JSON, skip if unable to parse
+    if (blueprint := read_json(blueprint_file)) is None:
+        return None
 
     # Rewrite blueprint to format it
-    with blueprint_file.open('w') as file_handle:
-        json_dump(blueprint, file_handle, indent=2)
+    write_if_changed(blueprint_file, format_json(blueprint))
+
+    return blueprint
+
+
+# File is entrypoint
+if __name__ == '__main__':
+    for blueprint_file in BLUEPRINT_FOLDER.glob('*/*/*/blueprint.json'):
+        lint_blueprint(blueprint_file)
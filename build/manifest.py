@@ -0,0 +1,267 @@
+"""
+Manifest of the content hashes of every Blueprint, used by the build to
+determine which Blueprints have changed since the last build.
+
+The manifest is committed, so it only contains digests. The modification
+time and size of each hashed file are kept in a separate local (ignored)
+cache, so that a fresh checkout - which resets every modification time -
+does not rewrite the manifest.
+"""
+
+from json import JSONDecodeError
+from pathlib import Path
+from typing import Optional
+
+from build.utils import (
+    BLUEPRINT_FOLDER, ROOT, format_json, get_digest, loads, minify_json,
+    write_if_changed,
+)
+
+
+MANIFEST_FILE = ROOT / 'build_manifest.json'
+MANIFEST_VERSION = 2
+FONT_SUFFIXES = ('.otf', '.ttc', '.ttf', '.woff', '.woff2')
+FILE_CACHE = ROOT / '.build_cache.json'
+FILE_CACHE_VERSION = 1
+
+
+def _read_versioned(file: Optional[Path], version: int, key: str) -> dict:
+    """Read the given key of the JSON file, if it is the given version."""
+
+    if file is None:
+        return {}
+
+    try:
+        content = loads(file.read_bytes())
+    except (FileNotFoundError, JSONDecodeError):
+        return {}
+
+    if content.get('version') != version:
+        return {}
+
+    return content.get(key, {})
+
+
+class FileCache:
+    """
+    Local (ignored) cache of the modification time, size, and digest of
+    files within the blueprints folder. The modification time and size
+    are only used as a fast path to skip hashing unchanged files. Only
+    the files cached by the latest run are kept. If `file` is None,
+    nothing is written.
+    """
+
+    def __init__(self,
+            file: Optional[Path] = FILE_CACHE,
+            blueprint_folder: Path = BLUEPRINT_FOLDER,
+        ) -> None:
+
+        self.file = file
+        self.blueprint_folder = blueprint_folder
+        self._previous: dict[str, dict] = _read_versioned(
+            file, FILE_CACHE_VERSION, 'files'
+        )
+        self.files: dict[str, dict] = {}
+
+
+    def get_key(self, file: Path) -> str:
+        """Get the cache key for the given file."""
+
+        return file.relative_to(self.blueprint_folder).as_posix()
+
+
+    def lookup(self, file: Path) -> Optional[str]:
+        """
+        Get the cached digest of the given file if its modification time
+        and size are unchanged since the last run.
+
+        Args:
+            file: Path to the file (within the blueprints folder).
+
+        Returns:
+            The cached digest, or None if the file must be hashed.
+        """
+
+        if (entry := self._previous.get(self.get_key(file))) is None:
+            return None
+
+        stat = file.stat()
+        if (entry['mtime_ns'] == stat.st_mtime_ns
+            and entry['size'] == stat.st_size):
+            return entry['digest']
+
+        return None
+
+
+    def cache(self, file: Path, digest: str) -> None:
+        """Cache the modification time and size of the given file."""
+
+        stat = file.stat()
+        self.files[self.get_key(file)] = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'digest': digest,
+        }
+
+
+    def hash_file(self, file: Path) -> str:
+        """
+        Get (and cache) the digest of the given file, reusing the cached
+        digest if the file is unchanged.
+        """
+
+        if (digest := self.lookup(file)) is None:
+            digest = get_digest(file.read_bytes())
+        self.cache(file, digest)
+
+        return digest
+
+
+    def save(self) -> bool:
+        """
+        Write this cache to file.
+
+        Returns:
+            Whether the file was written.
+        """
+
+        if self.file is None:
+            return False
+
+        return write_if_changed(self.file, minify_json({
+            'version': FILE_CACHE_VERSION,
+            'files': dict(sorted(self.files.items())),
+        }))
+
+
+class BuildManifest:
+    """
+    Record of the content digest of each Blueprint folder, and of each
+    Font file within it. The digests are what determine whether a
+    Blueprint has changed, so the manifest remains valid across fresh
+    checkouts.
+
+    Each file is hashed through the local file cache (see `FileCache`),
+    which is only used to skip hashing unchanged files. If `cache_file`
+    is None, the file cache is not written.
+    """
+
+    def __init__(self,
+            file: Path = MANIFEST_FILE,
+            cache_file: Optional[Path] = FILE_CACHE,
+            blueprint_folder: Path = BLUEPRINT_FOLDER,
+        ) -> None:
+
+        self.file = file
+        self.blueprint_folder = blueprint_folder
+        self.file_cache = FileCache(cache_file, blueprint_folder)
+        self._previous: dict[str, dict] = _read_versioned(
+            file, MANIFEST_VERSION, 'blueprints'
+        )
+        self.entries: dict[str, dict] = {}
+
+
+    def get_key(self, blueprint_file: Path) -> str:
+        """Get the manifest key for the given blueprint.json file."""
+
+        return blueprint_file.parent.relative_to(self.blueprint_folder).as_posix()
+
+
+    def get_previous_digest(self, blueprint_file: Path) -> Optional[str]:
+        """Get the digest recorded by the last build, if any."""
+
+        if (entry := self._previous.get(self.get_key(blueprint_file))):
+            return entry['digest']
+
+        return None
+
+
+    def get_previous_fonts(self, blueprint_file: Path) -> dict[str, str]:
+        """Get the Font digests recorded by the last build, if any."""
+
+        if (entry := self._previous.get(self.get_key(blueprint_file))):
+            return entry.get('fonts', {})
+
+        return {}
+
+
+    def record(self,
+            blueprint_file: Path,
+            digest: str,
+            fonts: Optional[dict[str, str]] = None,
+        ) -> None:
+        """
+        Record the digest of the given blueprint.json file, and of the
+        Font files in its folder.
+        """
+
+        self.entries[self.get_key(blueprint_file)] = {
+            'digest': digest, 'fonts': fonts or {},
+        }
+        self.file_cache.cache(blueprint_file, digest)
+
+
+    def hash_file(self, file: Path) -> str:
+        """
+        Get the digest of the given file, reusing the cached digest if
+        the file is unchanged.
+        """
+
+        return self.file_cache.hash_file(file)
+
+
+    def hash_fonts(self, blueprint_file: Path) -> dict[str, str]:
+        """
+        Get the digest of each Font file in the folder of the given
+        blueprint.json file, reusing the cached digests of any unchanged
+        files.
+        """
+
+        fonts = {}
+        for file in sorted(blueprint_file.parent.iterdir()):
+            if file.suffix.lower() in FONT_SUFFIXES:
+                fonts[file.name] = self.hash_file(file)
+
+        return fonts
+
+
+    @property
+    def removed(self) -> set[str]:
+        """Keys of all Blueprints in the last build but not this one."""
+
+        return set(self._previous) - set(self.entries)
+
+
+    @property
+    def digests_changed(self) -> bool:
+        """Whether any Blueprint was added, removed, or modified."""
+
+        return self._previous != self.entries
+
+
+    def save(self, force: bool = False) -> bool:
+        """
+        Write this manifest (and the local file cache) to file. To avoid
+        needless churn, the manifest is only written if any digest has
+        changed (or if forced).
+
+        Args:
+            force: Whether to write the manifest even if no digests
+                have changed.
+
+        Returns:
+            Whether the manifest file was written.
+        """
+
+        self.file_cache.save()
+
+        if not force and not self.digests_changed:
+            return False
+
+        return write_if_changed(
+            self.file,
+            format_json({
+                'version': MANIFEST_VERSION,
+                'blueprints': dict(sorted(self.entries.items())),
+            }),
+        )
@@ -4,182 +4,508 @@ Python script to be called by a GitHub action.
 This script parses the Github Issue JSON contained in the GITHUB_CONTEXT
 environment variable. It parses this content and creates the necessary
 Blueprint, and all the associated files.
+
+Alternatively, a batch of queued issues can be processed concurrently
+by passing a file of JSON lines (each with an issue `body`, and an
+optional `creator`) with the --batch argument.
+
+All files are streamed to disk in chunks (with size limits), font zips
+are verified before extraction, and each submission is processed within
+its own temporary directory. Files are downloaded with a pluggable
+fetcher so that submissions can be processed against a local stand-in
+rather than GitHub.
 """
 
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from json import dump as json_dump, loads, JSONDecodeError
+from json import JSONDecodeError
 from os import environ
-from pathlib import Path
-from re import compile as re_compile, sub as re_sub, IGNORECASE
-from shutil import copy as copy_file, unpack_archive, ReadError
+from pathlib import Path, PurePosixPath
+from re import compile as re_compile
+from shutil import copy as copy_file, copyfileobj, rmtree
 from sys import exit as sys_exit
+from tempfile import TemporaryDirectory
+from typing import NamedTuple, Optional, Protocol
+from zipfile import BadZipFile, ZipFile
+
+from requests import RequestException, Session
+from requests.adapters import HTTPAdapter
+
+from build.utils import BLUEPRINT_FOLDER, format_json, get_blueprint_folders, loads
+from models.validation import validate_blueprint
+
+
+DEFAULT_CREATOR = 'CollinHeist'
+
+CHUNK_SIZE = 64 * 1024
+MAX_PREVIEW_SIZE = 25 * 1024 * 1024
+MAX_ZIP_SIZE = 50 * 1024 * 1024
+MAX_UNZIPPED_SIZE = 100 * 1024 * 1024
+MAX_ZIP_FILES = 50
 
-from requests import get
+ISSUE_REGEX = re_compile(
+    r'^### Series Name\s+(?P<series_name>.+)\s+'
+    r'### Series Year\s+(?P<series_year>\d+)\s+'
+    r'### Creator Username\s+(?P<creator>.+)\s+'
+    r'### Blueprint Description\s+(?P<description>[\s\S]*)\s+'
+    r'### Blueprint\s+```json\s+(?P<blueprint>[\s\S]*?)```\s+'
+    r'### Preview Title Card\s+.*?\[.*\]\((?P<preview_url>.+)\)\s+'
+    r'### Zip of Font Files\s+(_No response_|\[.+?\]\((?P<font_zip>http[^\s\)]+)\))\s*$'
+)
 
 
-ROOT = Path(__file__).parent.parent
-BLUEPRINT_FOLDER = ROOT / 'blueprints'
-TEMP_PREVIEW_FILE = ROOT / 'preview.jpg'
-TEMP_FILE = ROOT / 'tmp'
-TEMP_DIRECTORY = ROOT / 'unzipped'
-PATH_SAFE_TRANSLATION = str.maketrans({
-    '?': '!',
-    '<': '',
-    '>': '',
-    ':':' -',
-    '"': '',
-    '|': '',
-    '*': '-',
-    '/': '+',
-    '\\': '+',
-})
+class SubmissionError(Exception):
+    """Raised when a submission cannot be turned into a Blueprint."""
 
 
-def get_blueprint_folders(series_name: str) -> tuple[str, str]:
+class Submission(NamedTuple):
+    series_name: str
+    series_year: str
+    creator: str
+    description: str
+    blueprint: dict
+    preview_url: str
+    font_zip_url: Optional[str]
+
+
+class Fetcher(Protocol):
+    def fetch(self, url: str, destination: Path, max_size: int) -> Path:
+        """Download the given URL into the destination file."""
+
+
+class HttpFetcher:
+    """
+    Fetcher which streams files over HTTP with a connection-pooled
+    session. Any URL prefixes in `url_map` are replaced before the
+    file is requested, which allows running against a local stand-in
+    HTTP server.
     """
-    Get the path-safe name for the given Series name.
 
-    Args:
-        series_name: Name of the Series.
+    def __init__(self,
+            url_map: Optional[dict[str, str]] = None,
+            pool_size: int = 8,
+            timeout: int = 30,
+        ) -> None:
 
-    Returns:
-        Path-safe name with prefix a/an/the and any illegal characters
-        (e.g. '?', '|', '/', etc.) removed.
+        self.url_map = url_map or {}
+        self.timeout = timeout
+        self.session = Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+
+    def fetch(self, url: str, destination: Path, max_size: int) -> Path:
+        """
+        Stream the given URL into the destination file.
+
+        Args:
+            url: URL to download.
+            destination: File to write the downloaded content to.
+            max_size: Maximum number of bytes to download.
+
+        Returns:
+            Path to the downloaded file.
+
+        Raises:
+            SubmissionError: If the file cannot be downloaded, or is
+                larger than the maximum size.
+        """
+
+        for prefix, replacement in self.url_map.items():
+            if url.startswith(prefix):
+                url = replacement + url.removeprefix(prefix)
+                break
+
+        try:
+            with self.session.get(url, stream=True, timeout=self.timeout) as response:
+                if not response.ok:
+                    raise SubmissionError(
+                        f'Unable to download "{url}" - {response.status_code}'
+                    )
+
+                # Reject early if the server reports a size over the limit
+                try:
+                    content_length = int(response.headers.get('Content-Length', 0))
+                except ValueError as exc:
+                    raise SubmissionError(
+                        f'"{url}" has an invalid Content-Length'
+                    ) from exc
+                if content_length > max_size:
+                    raise SubmissionError(f'"{url}" is larger than {max_size} bytes')
+
+                size = 0
+                with destination.open('wb') as file_handle:
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        size += len(chunk)
+                        if size > max_size:
+                            raise SubmissionError(
+                                f'"{url}" is larger than {max_size} bytes'
+                            )
+                        file_handle.write(chunk)
+        except RequestException as exc:
+            raise SubmissionError(f'Unable to download "{url}" - {exc}') from exc
+
+        return destination
+
+
+class LocalFetcher:
+    """
+    Fetcher which copies files from a local folder instead of
+    downloading them, for processing submissions offline. The last
+    component of each URL is used as the name of the file to copy.
     """
 
-    clean_name = str(series_name).translate(PATH_SAFE_TRANSLATION)
-    sort_name = re_sub(r'^(a|an|the)(\s)', '', clean_name, flags=IGNORECASE)
+    def __init__(self, folder: Path) -> None:
+        self.folder = folder
 
-    return sort_name[0].upper(), clean_name
 
+    def fetch(self, url: str, destination: Path, max_size: int) -> Path:
+        """Copy the file named by the given URL into the destination."""
 
-# File is entrypoint
-if __name__ == '__main__':
-    # Parse issue from environment variable
-    try:
-        content = loads(environ.get('ISSUE_BODY'))
-        print(f'Parsed issue JSON as:\n{content}')
-    except JSONDecodeError as exc:
-        print(f'Unable to parse Context as JSON')
-        print(exc)
-        sys_exit(1)
+        source = self.folder / url.rstrip('/').rsplit('/', maxsplit=1)[-1]
+        if not source.exists():
+            raise SubmissionError(f'Unable to find "{url}" in {self.folder}')
+        if source.stat().st_size > max_size:
+            raise SubmissionError(f'"{url}" is larger than {max_size} bytes')
 
-    # Get the issue's author and the body (the issue text itself)
-    creator = environ.get('ISSUE_CREATOR', 'CollinHeist')
+        copy_file(source, destination)
 
-    # Extract the data from the issue text
-    issue_regex = re_compile(
-        r'^### Series Name\s+(?P<series_name>.+)\s+'
-        r'### Series Year\s+(?P<series_year>\d+)\s+'
-        r'### Creator Username\s+(?P<creator>.+)\s+'
-        r'### Blueprint Description\s+(?P<description>[\s\S]*)\s+'
-        r'### Blueprint\s+```json\s+(?P<blueprint>[\s\S]*?)```\s+'
-        r'### Preview Title Card\s+.*?\[.*\]\((?P<preview_url>.+)\)\s+'
-        r'### Zip of Font Files\s+(_No response_|\[.+?\]\((?P<font_zip>http[^\s\)]+)\))\s*$'
-    )
+        return destination
 
-    # If data cannot be extracted, exit
-    if not (data_match := issue_regex.match(content)):
-        print(f'Unable to parse Blueprint from Issue')
-        print(f'{content=!r}')
-        sys_exit(1)
+
+def write_step_summary(title: str, details: str) -> None:
+    """
+    Add the given details to the summary of the current GitHub workflow
+    step (if running in a workflow), so that submitters can see why their
+    submission failed without reading the step log.
+    """
+
+    if not (summary_file := environ.get('GITHUB_STEP_SUMMARY')):
+        return
+
+    with Path(summary_file).open('a') as file_handle:
+        file_handle.write(f'## {title}\n\n```\n{details}\n```\n')
+
+
+def parse_issue(
+        content: str,
+        default_creator: str = DEFAULT_CREATOR,
+    ) -> Submission:
+    """
+    Parse the given issue body into a Submission.
+
+    Args:
+        content: Body of the issue.
+        default_creator: Creator to use if the issue does not specify
+            one (generally the author of the issue).
+
+    Returns:
+        The parsed Submission.
+
+    Raises:
+        SubmissionError: If the issue or its Blueprint cannot be parsed.
+    """
+
+    # Extract the data from the issue text
+    if not (data_match := ISSUE_REGEX.match(content)):
+        raise SubmissionError(f'Unable to parse Blueprint from Issue {content=!r}')
 
     # Get each variable from the issue
     data = {'font_zip': '_No response_'} | data_match.groupdict()
-    print(f'{data=}')
-    series_name = data['series_name'].strip()
-    series_year = data['series_year']
-    creator = (creator if '_No response_' in data['creator'] else data['creator']).strip()
-    description = data['description']
-    blueprint = data['blueprint']
-    preview_url = data['preview_url']
     if data.get('font_zip') is None or '_No response_' in data['font_zip']:
         font_zip_url = None
     else:
         font_zip_url = data['font_zip']
-    print(f'Raw parsed data: {series_name=}\n[{series_year=}\n{creator=}\n{description=}\n{blueprint=}\n{preview_url=}\n{font_zip_url=}')
-
 
     # Parse blueprint as JSON
     try:
-        blueprint = loads(blueprint)
-    except JSONDecodeError:
-        print(f'Unable to parse blueprint as JSON')
-        print(f'{blueprint=!r}')
-        sys_exit(1)
+        blueprint = loads(data['blueprint'])
+    except JSONDecodeError as exc:
+        raise SubmissionError(
+            f'Unable to parse blueprint as JSON {data["blueprint"]!r}'
+        ) from exc
+
+    return Submission(
+        series_name=data['series_name'].strip(),
+        series_year=data['series_year'],
+        creator=(
+            default_creator if '_No response_' in data['creator']
+            else data['creator']
+        ).strip(),
+        description=data['description'],
+        blueprint=blueprint,
+        preview_url=data['preview_url'],
+        font_zip_url=font_zip_url,
+    )
 
-    # Get the associated folder for this Series
-    letter, folder_name = get_blueprint_folders(f'{series_name} ({series_year})')
 
-    # Create Series folder
-    series_subfolder = BLUEPRINT_FOLDER / letter / folder_name
-    series_subfolder.mkdir(exist_ok=True, parents=True)
+def extract_font_zip(zip_file: Path, directory: Path) -> list[Path]:
+    """
+    Verify and extract the top-level files of the given zip. Any
+    directories within the zip are skipped.
+
+    Args:
+        zip_file: Zip file to extract.
+        directory: Directory to extract the files into.
 
-    # Find first sequential ID subfolder that does not exist
-    id_ = 0
-    while (blueprint_subfolder := series_subfolder / str(id_)).exists():
-        id_ += 1
+    Returns:
+        List of the extracted files.
 
-    # Create Blueprint ID folder
-    blueprint_subfolder.mkdir(exist_ok=True, parents=True)
-    print(f'Created blueprints/{letter}/{folder_name}/{id_}')
+    Raises:
+        SubmissionError: If the zip is invalid, contains unsafe paths,
+            or is too large when extracted.
+    """
+
+    try:
+        with ZipFile(zip_file) as archive:
+            members = archive.infolist()
+
+            # Verify zip contents before extracting anything; check the
+            # (declared) sizes before decompressing anything to test it
+            if len(members) > MAX_ZIP_FILES:
+                raise SubmissionError(f'Zip contains more than {MAX_ZIP_FILES} files')
+            if sum(member.file_size for member in members) > MAX_UNZIPPED_SIZE:
+                raise SubmissionError(f'Zip is larger than {MAX_UNZIPPED_SIZE} bytes when extracted')
+            if (bad_file := archive.testzip()) is not None:
+                raise SubmissionError(f'Zip contains corrupt file {bad_file}')
+
+            extracted = []
+            for member in members:
+                path = PurePosixPath(member.filename)
+                if path.is_absolute() or '..' in path.parts:
+                    raise SubmissionError(f'Zip contains unsafe path {member.filename}')
+                if member.is_dir() or len(path.parts) > 1:
+                    print(f'Skipping directory [zip]/{member.filename}')
+                    continue
+
+                destination = directory / path.name
+                with archive.open(member) as source, destination.open('wb') as file_handle:
+                    copyfileobj(source, file_handle, CHUNK_SIZE)
+                extracted.append(destination)
+    except BadZipFile as exc:
+        raise SubmissionError('Unable to unzip provided files') from exc
+
+    return extracted
+
+
+def create_blueprint(
+        submission: Submission,
+        fetcher: Fetcher,
+        blueprint_folder: Path = BLUEPRINT_FOLDER,
+    ) -> Path:
+    """
+    Create the Blueprint, and all of its associated files, for the
+    given Submission.
+
+    Args:
+        submission: Submission to create the Blueprint of.
+        fetcher: Fetcher to download the preview and font zip with.
+        blueprint_folder: Root folder to create the Blueprint within.
+
+    Returns:
+        Path to the created Blueprint subfolder.
+
+    Raises:
+        SubmissionError: If the Blueprint cannot be created.
+    """
 
     # Generate base blueprint
-    finalized_blueprint = blueprint | {
-        'creator': creator,
-        'description': [line.strip() for line in description.splitlines() if line.strip()],
+    finalized_blueprint = submission.blueprint | {
+        'creator': submission.creator,
+        'description': [
+            line.strip() for line in submission.description.splitlines()
+            if line.strip()
+        ],
+        'preview': 'preview.jpg',
+        'created': datetime.now().strftime('%Y-%m-%dT%H:%M:%S'),
     }
 
-    # Download preview
-    if not (response := get(preview_url, timeout=30)).ok:
-        print(f'Unable to download preview file from "{preview_url}"')
-        print(response.content)
-        sys_exit(1)
-    print(f'Downloaded preview "{preview_url}"')
-
-    # Copy preview into blueprint folder
-    TEMP_PREVIEW_FILE.write_bytes(response.content)
-    copy_file(TEMP_PREVIEW_FILE, blueprint_subfolder / 'preview.jpg')
-    print(f'Copied "{preview_url}" into blueprints/{letter}/{folder_name}/{id_}/preview.jpg')
-
-    # Add preview image to blueprint
-    finalized_blueprint['preview'] = 'preview.jpg'
-
-    # Download any font zip files if provided
-    if font_zip_url is not None:
-        if not (response := get(font_zip_url, timeout=30)).ok:
-            print(f'Unable to download zip from "{font_zip_url}"')
-            print(response.content)
-            sys_exit(1)
-        print(f'Downloaded "{font_zip_url}"')
-        zip_content = response.content
-        
-        # Write zip to file
-        uploaded_filename = font_zip_url.rsplit('/', maxsplit=1)[-1]
-        downloaded_file = ROOT / uploaded_filename
-        downloaded_file.write_bytes(zip_content)
+    # Validate Blueprint before downloading anything
+    if (errors := validate_blueprint(finalized_blueprint)):
+        raise SubmissionError('Blueprint is invalid\n' + '\n'.join(
+            f'  [{field}]: {error}' for field, error in errors
+        ))
+
+    with TemporaryDirectory(prefix='submission-') as temp_directory:
+        temp_directory = Path(temp_directory)
+
+        # Download preview
+        preview = fetcher.fetch(
+            submission.preview_url, temp_directory / 'preview.jpg',
+            MAX_PREVIEW_SIZE,
+        )
+        print(f'Downloaded preview "{submission.preview_url}"')
+
+        # Download and extract any font zip files if provided
+        font_files = []
+        if submission.font_zip_url is not None:
+            zip_file = fetcher.fetch(
+                submission.font_zip_url, temp_directory / 'fonts.zip',
+                MAX_ZIP_SIZE,
+            )
+            print(f'Downloaded "{submission.font_zip_url}"')
+            unzipped = temp_directory / 'unzipped'
+            unzipped.mkdir()
+            font_files = extract_font_zip(zip_file, unzipped)
+            print(f'Unzipped {[file.name for file in font_files]}')
+
+        # Get the associated folder for this Series
+        letter, folder_name = get_blueprint_folders(
+            f'{submission.series_name} ({submission.series_year})'
+        )
+
+        # Create Series folder
+        series_subfolder = blueprint_folder / letter / folder_name
+        series_subfolder.mkdir(exist_ok=True, parents=True)
+
+        # Claim the first sequential ID subfolder that does not exist
+        id_ = 0
+        while True:
+            blueprint_subfolder = series_subfolder / str(id_)
+            try:
+                blueprint_subfolder.mkdir()
+                break
+            except FileExistsError:
+                id_ += 1
+        print(f'Created blueprints/{letter}/{folder_name}/{id_}')
+
+        # Copy preview and fonts into blueprint folder, then write the
+        # Blueprint; remove the claimed folder if any of this fails
+        try:
+            copy_file(preview, blueprint_subfolder / 'preview.jpg')
+            for file in font_files:
+                copy_file(file, blueprint_subfolder / file.name)
+                print(f'Copied [zip]/{file.name} into blueprints/{letter}/{folder_name}/{id_}/{file.name}')
+
+            blueprint_file = blueprint_subfolder / 'blueprint.json'
+            blueprint_file.write_text(format_json(finalized_blueprint))
+        except BaseException:
+            rmtree(blueprint_subfolder, ignore_errors=True)
+            raise
+        print(f'Wrote Blueprint at blueprints/{letter}/{folder_name}/{id_}/blueprint.json')
+
+    return blueprint_subfolder
+
+
+def process_batch(
+        batch_file: Path,
+        fetcher: Fetcher,
+        workers: int = 4,
+        blueprint_folder: Path = BLUEPRINT_FOLDER,
+    ) -> list[tuple[int, Optional[Path], Optional[str]]]:
+    """
+    Process all queued issues in the given file concurrently.
 
+    Args:
+        batch_file: File of JSON lines, each with an issue `body` and
+            an optional `creator`.
+        fetcher: Fetcher to download all files with.
+        workers: Number of submissions to process at once.
+        blueprint_folder: Root folder to create the Blueprints within.
+
+    Returns:
+        List of the line number, created Blueprint subfolder (if
+        successful), and error (if unsuccessful) of each submission.
+    """
+
+    def process(line_number: int, line: str) -> tuple[int, Optional[Path], Optional[str]]:
         try:
-            unpack_archive(downloaded_file, TEMP_DIRECTORY)
-        except (ValueError, ReadError):
-            print(f'Unable to unzip provided files from "{font_zip_url}"')
-            sys_exit(1)
+            issue = loads(line)
+            submission = parse_issue(
+                issue['body'], issue.get('creator', DEFAULT_CREATOR)
+            )
+            return (
+                line_number,
+                create_blueprint(submission, fetcher, blueprint_folder),
+                None,
+            )
+        except (JSONDecodeError, KeyError, TypeError) as exc:
+            return line_number, None, f'Unable to parse queued issue - {exc}'
+        except SubmissionError as exc:
+            return line_number, None, str(exc)
+        except Exception as exc:
+            # Any other failure must not discard the rest of the batch
+            return line_number, None, f'Unable to create Blueprint - {exc!r}'
+
+    lines = [
+        (line_number, line)
+        for line_number, line in enumerate(batch_file.read_text().splitlines(), start=1)
+        if line.strip()
+    ]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda args: process(*args), lines))
+
 
-        print(f'Unzipped {[file.name for file in TEMP_DIRECTORY.glob("*")]}')
+# File is entrypoint
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Create Blueprints from submissions')
+    parser.add_argument(
+        '--batch',
+        type=Path,
+        default=None,
+        help='File of JSON lines of queued issues to process',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=4,
+        help='Number of queued issues to process at once',
+    )
+    parser.add_argument(
+        '--local-files',
+        type=Path,
+        default=None,
+        help='Folder to read all files from instead of downloading them',
+    )
+    parser.add_argument(
+        '--url-map',
+        nargs=2,
+        action='append',
+        metavar=('PREFIX', 'REPLACEMENT'),
+        default=[],
+        help='Replace the given URL prefix when downloading files',
+    )
+    args = parser.parse_args()
 
-        for file in TEMP_DIRECTORY.glob('*'):
-            if file.is_dir():
-                print(f'Skipping directory [zip]/{file.name}')
-                continue
+    if args.local_files is not None:
+        fetcher = LocalFetcher(args.local_files)
+    else:
+        fetcher = HttpFetcher(dict(args.url_map), pool_size=max(args.workers, 1))
+
+    # Process a batch of queued issues
+    if args.batch is not None:
+        results = process_batch(args.batch, fetcher, args.workers)
+        for line_number, blueprint_subfolder, error in results:
+            if error is None:
+                print(f'[{line_number}] Created {blueprint_subfolder}')
+            else:
+                print(f'[{line_number}] Failed - {error}')
+        if (failures := [
+                f'[{line_number}] {error}' for line_number, _, error in results
+                if error is not None]):
+            write_step_summary('Blueprint Submissions Failed', '\n'.join(failures))
+        sys_exit(int(bool(failures)))
 
-            copy_file(file, blueprint_subfolder / file.name)
-            print(f'Copied [zip]/{file.name} into blueprints/{letter}/{folder_name}/{id_}/{file.name}')
+    # Parse issue from environment variable
+    try:
+        content = loads(environ.get('ISSUE_BODY'))
+        print(f'Parsed issue JSON as:\n{content}')
+    except JSONDecodeError as exc:
+        print(f'Unable to parse Context as JSON')
+        print(exc)
+        write_step_summary('Unable to parse Issue', str(exc))
+        sys_exit(1)
 
-    # Add creation time to Blueprint
-    finalized_blueprint['created'] = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+    # Get the issue's author and the body (the issue text itself)
+    creator = environ.get('ISSUE_CREATOR', DEFAULT_CREATOR)
 
-    # Write Blueprint as JSON
-    blueprint_file = blueprint_subfolder / 'blueprint.json'
-    with blueprint_file.open('w') as file_handle:
-        json_dump(finalized_blueprint, file_handle, indent=2)
-    print(f'Wrote Blueprint at blueprints/{letter}/{folder_name}/{id_}/blueprint.json')
+    try:
+        submission = parse_issue(content, creator)
+        print(f'Parsed submission: {submission}')
+        create_blueprint(submission, fetcher)
+    except SubmissionError as exc:
+        print(exc)
+        write_step_summary('Blueprint Submission Failed', str(exc))
+        sys_exit(1)
@@ -2,41 +2,312 @@
 Python script to be called by a GitHub action.
 
 This script resizes all preview images to a size of 1920x1080.
+
+Previews are normalized in parallel, and the digest of each normalized
+preview is recorded in a cache so that previews which have already been
+normalized are never decoded again. The digest itself is only computed
+if the preview's modification time or size have changed (see
+`FileCache`).
+
+Optionally, compressed thumbnail and WebP derivatives of each preview
+can be created. These are local-only (the derivative folder is not
+committed or published) and are intended for local tooling.
 """
-from json import load as json_load, JSONDecodeError
+
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from time import perf_counter
+from typing import Literal, NamedTuple, Optional
 
 from imagesize import get as get_image_size
-from PIL import Image
+from PIL import Image, ImageOps
+
+from build.manifest import FileCache
+from build.utils import (
+    BLUEPRINT_FOLDER, ROOT, format_json, get_digest, read_json,
+    write_if_changed,
+)
 
 
 IMAGE_SIZE = (1920, 1080)
+THUMBNAIL_SIZE = (480, 270)
+THUMBNAIL_QUALITY = 80
+WEBP_QUALITY = 80
 
-BLUEPRINT_FOLDER = Path(__file__).parent.parent / 'blueprints'
+PREVIEW_CACHE = ROOT / 'preview_cache.json'
+PREVIEW_FILE_CACHE = ROOT / '.preview_file_cache.json'
+DERIVATIVE_FOLDER = ROOT / 'previews'
 
-REPO_URL = (
-    'https://github.com/CollinHeist/TitleCardMaker-Blueprints/'
-    'raw/master/blueprints'
-)
+FitMode = Literal['stretch', 'contain', 'cover']
+
+
+class PreviewResult(NamedTuple):
+    preview: Path
+    resized: bool
+    digest: str
+    original_bytes: int
+    final_bytes: int
+    derivative_bytes: int
+    duration: float
+
+
+def is_correct_size(width: int, height: int) -> bool:
+    """Whether the given dimensions are (approximately) 1920x1080."""
+
+    return (width in range(IMAGE_SIZE[0]-5, IMAGE_SIZE[0]+5)
+            and height in range(IMAGE_SIZE[1]-5, IMAGE_SIZE[1]+5))
+
+
+def open_image(preview: Path, size: tuple[int, int]) -> Image.Image:
+    """
+    Open the given image, using JPEG draft mode so that the image is
+    decoded at the smallest scale that is still at least the given
+    size.
+    """
+
+    image = Image.open(preview)
+    if image.format == 'JPEG':
+        image.draft('RGB', size)
+
+    return image
+
+
+def fit_image(
+        image: Image.Image,
+        size: tuple[int, int],
+        fit: FitMode,
+    ) -> Image.Image:
+    """
+    Resize the given image to the given size.
+
+    Args:
+        image: Image to resize.
+        size: Dimensions of the resized image.
+        fit: How to handle a differing aspect ratio. `stretch` ignores
+            the aspect ratio, `contain` pads the image with black, and
+            `cover` crops the image.
+
+    Returns:
+        The resized RGB image.
+    """
+
+    # Convert to RGB (in case it was RGBA)
+    image = image.convert('RGB')
+    if fit == 'contain':
+        return ImageOps.pad(image, size, Image.LANCZOS, color='black')
+    if fit == 'cover':
+        return ImageOps.fit(image, size, Image.LANCZOS)
+
+    return image.resize(size, Image.LANCZOS, reducing_gap=3.0)
+
+
+def write_derivatives(
+        image: Image.Image,
+        derivative_subfolder: Path,
+    ) -> int:
+    """
+    Write the compressed thumbnail and WebP derivatives of the given
+    (normalized) preview image.
+
+    Args:
+        image: Normalized preview image.
+        derivative_subfolder: Folder to write the derivatives into.
+
+    Returns:
+        Total number of bytes of the written derivatives.
+    """
+
+    derivative_subfolder.mkdir(parents=True, exist_ok=True)
+
+    # Full size WebP
+    webp = derivative_subfolder / 'preview.webp'
+    image.save(webp, 'WEBP', quality=WEBP_QUALITY)
+
+    # Thumbnail
+    thumbnail = derivative_subfolder / 'thumbnail.jpg'
+    image.resize(THUMBNAIL_SIZE, Image.LANCZOS, reducing_gap=2.0).save(
+        thumbnail, 'JPEG', quality=THUMBNAIL_QUALITY, optimize=True,
+        progressive=True,
+    )
 
+    return webp.stat().st_size + thumbnail.stat().st_size
 
-for blueprint_file in BLUEPRINT_FOLDER.glob('*/*/*/blueprint.json'):
-    # Read this blueprint file
-    with blueprint_file.open('r') as file_handle:
+
+def normalize_preview(
+        preview: Path,
+        fit: FitMode = 'stretch',
+        derivative_subfolder: Optional[Path] = None,
+    ) -> PreviewResult:
+    """
+    Normalize the given preview to 1920x1080, and optionally write its
+    derivatives. This is executed in a worker process.
+
+    Args:
+        preview: Path to the preview image.
+        fit: How to handle a differing aspect ratio.
+        derivative_subfolder: Folder to write derivatives into. If
+            omitted, no derivatives are written.
+
+    Returns:
+        The result of normalizing this preview.
+    """
+
+    start = perf_counter()
+    original_bytes = preview.stat().st_size
+
+    # Verify image is 1920x1080, only decode if a resize is required
+    resized = False
+    image = None
+    if not is_correct_size(*get_image_size(preview)):
+        image = fit_image(open_image(preview, IMAGE_SIZE), IMAGE_SIZE, fit)
+        image.save(preview)
+        resized = True
+
+    derivative_bytes = 0
+    if derivative_subfolder is not None:
+        if image is None:
+            image = open_image(preview, IMAGE_SIZE).convert('RGB')
+        derivative_bytes = write_derivatives(image, derivative_subfolder)
+
+    return PreviewResult(
+        preview=preview,
+        resized=resized,
+        digest=get_digest(preview.read_bytes()),
+        original_bytes=original_bytes,
+        final_bytes=preview.stat().st_size,
+        derivative_bytes=derivative_bytes,
+        duration=perf_counter() - start,
+    )
+
+
+def get_previews(blueprint_folder: Path = BLUEPRINT_FOLDER) -> list[Path]:
+    """Get the paths to all Blueprint preview images."""
+
+    previews = []
+    for blueprint_file in sorted(blueprint_folder.glob('*/*/*/blueprint.json')):
         # Parse JSON, skip if unable to parse
-        try:
-            blueprint = json_load(file_handle)
-        except JSONDecodeError:
+        if (blueprint := read_json(blueprint_file)) is None:
             continue
 
         # Get this Blueprint's preview
-        preview = blueprint_file.parent / blueprint['preview']
-
-        # Verify image is 1920x1080
-        width, height = get_image_size(preview)
-        if (width not in range(IMAGE_SIZE[0]-5, IMAGE_SIZE[0]+5)
-            or height not in range(IMAGE_SIZE[1]-5, IMAGE_SIZE[1]+5)):
-            # Open image; resize, convert to RGB (in case it was RGBA)
-            image = Image.open(preview).resize(IMAGE_SIZE).convert('RGB')
-            image.save(preview)
-            print(f'Resized "{preview}" to 1920x1080')
+        previews.append(blueprint_file.parent / blueprint['preview'])
+
+    return previews
+
+
+def resize_images(
+        fit: FitMode = 'stretch',
+        derivatives: bool = False,
+        workers: Optional[int] = None,
+        blueprint_folder: Path = BLUEPRINT_FOLDER,
+        cache_file: Path = PREVIEW_CACHE,
+        derivative_folder: Path = DERIVATIVE_FOLDER,
+        file_cache_file: Optional[Path] = PREVIEW_FILE_CACHE,
+    ) -> list[PreviewResult]:
+    """
+    Normalize all preview images which have not already been normalized.
+
+    Args:
+        fit: How to handle a differing aspect ratio.
+        derivatives: Whether to write thumbnail and WebP derivatives.
+        workers: Number of worker processes to use.
+        blueprint_folder: Root folder of all Blueprints.
+        cache_file: File of the digests of all normalized previews.
+        derivative_folder: Root folder to write derivatives into.
+        file_cache_file: File to cache the modification time and size
+            of each preview in, to skip hashing unchanged previews.
+
+    Returns:
+        List of results for each processed preview.
+    """
+
+    # Read the cache of already normalized previews
+    cache: dict[str, str] = {}
+    if cache_file.exists():
+        cache = read_json(cache_file) or {}
+
+    file_cache = FileCache(file_cache_file, blueprint_folder)
+
+    # Determine which previews require processing
+    pending: list[tuple[Path, Optional[Path]]] = []
+    new_cache: dict[str, str] = {}
+    for preview in get_previews(blueprint_folder):
+        key = preview.relative_to(blueprint_folder).as_posix()
+        derivative_subfolder = None
+        if derivatives:
+            derivative_subfolder = derivative_folder / preview.parent.relative_to(blueprint_folder)
+
+        # Skip previews which are unchanged since they were normalized
+        digest = file_cache.hash_file(preview)
+        if (cache.get(key) == digest
+            and (derivative_subfolder is None
+                 or (derivative_subfolder / 'thumbnail.jpg').exists())):
+            new_cache[key] = digest
+            continue
+
+        pending.append((preview, derivative_subfolder))
+
+    # Process all remaining previews in parallel
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(normalize_preview, preview, fit, derivative_subfolder)
+            for preview, derivative_subfolder in pending
+        ]
+        for future in futures:
+            result = future.result()
+            new_cache[result.preview.relative_to(blueprint_folder).as_posix()] = result.digest
+            file_cache.cache(result.preview, result.digest)
+            results.append(result)
+
+    # Write updated caches
+    write_if_changed(cache_file, format_json(dict(sorted(new_cache.items()))))
+    file_cache.save()
+
+    return results
+
+
+# File is entrypoint
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Resize all preview images')
+    parser.add_argument(
+        '--fit',
+        choices=('stretch', 'contain', 'cover'),
+        default='stretch',
+        help='How to resize previews with a non-16:9 aspect ratio',
+    )
+    parser.add_argument(
+        '--derivatives',
+        action='store_true',
+        help=f'Write (local-only) thumbnail and WebP previews into {DERIVATIVE_FOLDER.name}/',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of worker processes to use',
+    )
+    args = parser.parse_args()
+
+    start = perf_counter()
+    results = resize_images(args.fit, args.derivatives, args.workers)
+    for result in results:
+        if result.resized:
+            print(f'Resized "{result.preview}" to 1920x1080')
+        print(
+            f'{result.preview.relative_to(BLUEPRINT_FOLDER)}: '
+            f'{result.duration*1000:.0f}ms, '
+            f'{result.original_bytes:,} -> {result.final_bytes:,} bytes'
+            + (f' (+{result.derivative_bytes:,} derivative bytes)'
+               if result.derivative_bytes else '')
+        )
+
+    # Print summary
+    duration = perf_counter() - start
+    saved = sum(result.original_bytes - result.final_bytes for result in results)
+    print(
+        f'Processed {len(results)} previews in {duration:.2f}s '
+        f'({len(results) / duration if duration else 0:.1f} previews/s), '
+        f'saved {saved:,} bytes'
+    )
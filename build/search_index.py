@@ -0,0 +1,240 @@
+"""
+Precomputed inverted index for searching Blueprints by Series name,
+creator, card type, font, and Template filter argument.
+
+The index is written by the build (see `build_all.py`), and can be
+queried with the `SearchIndex` class, which lazily loads the index the
+first time it is searched. For example:
+
+>>> index = SearchIndex()
+>>> index.search('pokemon')
+[('Pokémon (1997)', 0), ('Pokémon (1997)', 1)]
+>>> index.search('anime', field='card_type')
+[...]
+"""
+
+from bisect import bisect_left
+from pathlib import Path
+from re import compile as re_compile
+from sys import exit as sys_exit
+from typing import Iterable, Optional
+from unicodedata import combining, normalize
+
+from build.utils import (
+    CATALOG_FOLDER, MASTER_BLUEPRINT, get_sort_name, loads, minify_json,
+    read_json, write_if_changed,
+)
+
+
+SEARCH_INDEX = CATALOG_FOLDER / 'search_index.json'
+SEARCH_FIELDS = ('series', 'creator', 'card_type', 'font', 'filter')
+
+_TOKEN_REGEX = re_compile(r'[a-z0-9]+')
+_YEAR_REGEX = re_compile(r'\s*\(\d{4}\)$')
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase the given text and remove any accents."""
+
+    return ''.join(
+        char for char in normalize('NFKD', str(text).lower())
+        if not combining(char)
+    )
+
+
+def tokenize(text: str) -> list[str]:
+    """Split the given text into normalized alphanumeric tokens."""
+
+    return _TOKEN_REGEX.findall(normalize_text(text))
+
+
+def get_series_tokens(series_full_name: str) -> set[str]:
+    """
+    Get the search tokens for the given Series name. In addition to the
+    individual words of the name, the sort name (without any prefix
+    a/an/the or year) is indexed as a single token so that partially
+    typed names (e.g. "bigbang") prefix-match.
+    """
+
+    sort_name = get_sort_name(series_full_name)
+    tokens = set(tokenize(series_full_name))
+    tokens.add(''.join(tokenize(_YEAR_REGEX.sub('', sort_name))))
+
+    return tokens - {''}
+
+
+def get_blueprint_tokens(blueprint: dict) -> dict[str, set[str]]:
+    """
+    Get the search tokens for each field of the given master Blueprint.
+
+    Args:
+        blueprint: Master Blueprint entry to index.
+
+    Returns:
+        Dictionary of field names to the tokens of that field.
+    """
+
+    tokens: dict[str, set[str]] = {field: set() for field in SEARCH_FIELDS}
+    tokens['series'] = get_series_tokens(blueprint['series_full_name'])
+
+    # Creators are comma-separated
+    for creator in map(str.strip, blueprint.get('creator', '').split(',')):
+        tokens['creator'].update(tokenize(creator))
+
+    # Card types of the Series and any Templates or Episodes
+    for obj in (blueprint.get('series', {}),
+                *blueprint.get('templates', []),
+                *blueprint.get('episodes', {}).values()):
+        if (card_type := obj.get('card_type')):
+            tokens['card_type'].update(tokenize(card_type))
+
+    # Font names and files
+    for font in blueprint.get('fonts', []):
+        tokens['font'].update(tokenize(font.get('name', '')))
+        if (file := font.get('file')):
+            tokens['font'].update(tokenize(Path(file).stem))
+
+    # Template filter arguments
+    for template in blueprint.get('templates', []):
+        for filter_ in template.get('filters', []):
+            tokens['filter'].update(tokenize(filter_.get('argument', '')))
+
+    return tokens
+
+
+def build_search_index(all_blueprints: list[dict]) -> dict:
+    """
+    Build the inverted index of the given master Blueprints.
+
+    Args:
+        all_blueprints: List of all master Blueprint entries.
+
+    Returns:
+        Dictionary of the indexed documents (Series name and Blueprint
+        ID), and for each field, a mapping of tokens to the sorted list
+        of document indices which contain that token.
+    """
+
+    documents = []
+    fields: dict[str, dict[str, list[int]]] = {
+        field: {} for field in SEARCH_FIELDS
+    }
+    for document_id, blueprint in enumerate(all_blueprints):
+        documents.append([blueprint['series_full_name'], blueprint['id']])
+        for field, tokens in get_blueprint_tokens(blueprint).items():
+            for token in tokens:
+                fields[field].setdefault(token, []).append(document_id)
+
+    return {
+        'documents': documents,
+        'fields': {
+            field: dict(sorted(postings.items()))
+            for field, postings in fields.items()
+        },
+    }
+
+
+def write_search_index(
+        all_blueprints: list[dict],
+        file: Path = SEARCH_INDEX,
+    ) -> bool:
+    """
+    Build and write the search index of the given master Blueprints.
+
+    Returns:
+        Whether the file was written.
+    """
+
+    return write_if_changed(file, minify_json(build_search_index(all_blueprints)))
+
+
+class SearchIndex:
+    """
+    Lazily loaded search index which answers prefix and token queries
+    against the precomputed inverted index.
+    """
+
+    def __init__(self, file: Path = SEARCH_INDEX) -> None:
+        self.file = file
+        self._documents: Optional[list[tuple[str, int]]] = None
+        self._tokens: dict[str, list[str]] = {}
+        self._postings: dict[str, dict[str, list[int]]] = {}
+
+
+    def _load(self) -> None:
+        """Load the index from file if it has not been loaded yet."""
+
+        if self._documents is not None:
+            return
+
+        index = loads(self.file.read_bytes())
+        self._documents = [tuple(document) for document in index['documents']]
+        self._postings = index['fields']
+        self._tokens = {
+            field: list(postings) for field, postings in self._postings.items()
+        }
+
+
+    def _match_token(self, field: str, prefix: str) -> set[int]:
+        """Get the documents with any token in the field with the prefix."""
+
+        tokens = self._tokens[field]
+        postings = self._postings[field]
+
+        matches = set()
+        position = bisect_left(tokens, prefix)
+        while position < len(tokens) and tokens[position].startswith(prefix):
+            matches.update(postings[tokens[position]])
+            position += 1
+
+        return matches
+
+
+    def search(self,
+            query: str,
+            field: Optional[str] = None,
+            limit: Optional[int] = None,
+        ) -> list[tuple[str, int]]:
+        """
+        Search for all Blueprints which match the given query. Every
+        token of the query must prefix-match some token of the Blueprint.
+
+        Args:
+            query: Text to search for.
+            field: Field to restrict the search to. If omitted, all
+                fields are searched.
+            limit: Maximum number of results to return.
+
+        Returns:
+            List of the matching Series names and Blueprint IDs, in
+            master Blueprint order.
+        """
+
+        self._load()
+
+        fields: Iterable[str] = SEARCH_FIELDS if field is None else (field,)
+        if field is not None and field not in SEARCH_FIELDS:
+            raise ValueError(f'Cannot search unknown field "{field}"')
+
+        matches: Optional[set[int]] = None
+        for token in tokenize(query):
+            token_matches = set().union(
+                *(self._match_token(field_, token) for field_ in fields)
+            )
+            matches = token_matches if matches is None else matches & token_matches
+            if not matches:
+                return []
+
+        if matches is None:
+            return []
+
+        return [self._documents[document] for document in sorted(matches)][:limit]
+
+
+# File is entrypoint
+if __name__ == '__main__':
+    # Parse Master Blueprint, exit if unable to parse
+    if (all_blueprints := read_json(MASTER_BLUEPRINT)) is None:
+        sys_exit(1)
+
+    write_search_index(all_blueprints)
@@ -0,0 +1,233 @@
+"""
+Shared helpers used by the build scripts.
+
+These functions handle the repository paths, JSON parsing, and writing
+generated files in a way that does not touch unchanged outputs.
+
+All JSON is read and written through this module. If orjson is installed
+it is used to parse JSON (and to serialize JSON when a stable format is
+not required); otherwise the standard library is used. Stable output is
+always formatted by the standard library so that it is byte-for-byte
+identical regardless of the installed backend.
+"""
+
+from hashlib import sha256
+from json import dumps as json_dumps, loads as json_loads, JSONDecodeError
+from os import replace as replace_file
+from pathlib import Path
+from re import sub as re_sub, IGNORECASE
+from tempfile import NamedTemporaryFile
+from typing import Any, Optional, Union
+
+try:
+    from orjson import (
+        dumps as orjson_dumps, loads as orjson_loads, OPT_INDENT_2,
+    )
+    JSON_BACKEND = 'orjson'
+except ImportError:
+    orjson_dumps, orjson_loads = None, None
+    JSON_BACKEND = 'json'
+
+
+ROOT = Path(__file__).parent.parent
+BLUEPRINT_FOLDER = ROOT / 'blueprints'
+MASTER_BLUEPRINT = ROOT / 'master_blueprints.json'
+MASTER_README = ROOT / 'README.md'
+CATALOG_FOLDER = ROOT / 'catalog'
+
+REPO_URL = (
+    'https://github.com/CollinHeist/TitleCardMaker-Blueprints/'
+    'raw/master/blueprints'
+)
+
+PATH_SAFE_TRANSLATION = str.maketrans({
+    '?': '!',
+    '<': '',
+    '>': '',
+    ':':' -',
+    '"': '',
+    '|': '',
+    '*': '-',
+    '/': '+',
+    '\\': '+',
+})
+
+
+def get_sort_name(series_name: str) -> str:
+    """
+    Get the name the given Series is sorted by.
+
+    Args:
+        series_name: Name of the Series.
+
+    Returns:
+        Path-safe name with any prefix a/an/the removed.
+    """
+
+    clean_name = str(series_name).translate(PATH_SAFE_TRANSLATION)
+
+    return re_sub(r'^(a|an|the)(\s)', '', clean_name, flags=IGNORECASE)
+
+
+def get_blueprint_folders(series_name: str) -> tuple[str, str]:
+    """
+    Get the path-safe name for the given Series name.
+
+    Args:
+        series_name: Name of the Series.
+
+    Returns:
+        Path-safe name with prefix a/an/the and any illegal characters
+        (e.g. '?', '|', '/', etc.) removed.
+    """
+
+    clean_name = str(series_name).translate(PATH_SAFE_TRANSLATION)
+
+    return get_sort_name(series_name)[0].upper(), clean_name
+
+
+def loads(content: Union[str, bytes]) -> Any:
+    """
+    Parse the given JSON content with the fastest available backend.
+
+    Args:
+        content: JSON text or bytes to parse.
+
+    Returns:
+        The parsed JSON content.
+
+    Raises:
+        JSONDecodeError: If the content cannot be parsed.
+    """
+
+    if orjson_loads is not None:
+        # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+        return orjson_loads(content)
+
+    return json_loads(content)
+
+
+def read_json(file: Path) -> Optional[Any]:
+    """
+    Read and parse the given JSON file.
+
+    Args:
+        file: Path to the file to parse.
+
+    Returns:
+        The parsed JSON content, or None if the file cannot be parsed.
+    """
+
+    try:
+        return loads(file.read_bytes())
+    except (JSONDecodeError, UnicodeDecodeError):
+        return None
+
+
+def format_json(content: Any, stable: bool = True) -> str:
+    """
+    Format the given content as the standard JSON used in this project.
+
+    Args:
+        content: Object to format.
+        stable: Whether the output must be byte-for-byte identical to
+            the standard formatting. If False, the fast backend (if
+            installed) is used, which does not escape non-ASCII text.
+
+    Returns:
+        The formatted JSON string.
+    """
+
+    if not stable and orjson_dumps is not None:
+        return orjson_dumps(content, option=OPT_INDENT_2).decode()
+
+    return json_dumps(content, indent=2)
+
+
+def minify_json(content: Any, stable: bool = True) -> bytes:
+    """
+    Serialize the given content as minified JSON.
+
+    Args:
+        content: Object to serialize.
+        stable: Whether the output must be byte-for-byte identical to
+            the standard formatting. If False, the fast backend (if
+            installed) is used.
+
+    Returns:
+        The minified JSON bytes.
+    """
+
+    if not stable and orjson_dumps is not None:
+        return orjson_dumps(content)
+
+    return json_dumps(content, separators=(',', ':')).encode()
+
+
+def get_letter(blueprint: dict) -> str:
+    """
+    Get the letter subfolder of the given master Blueprint entry.
+
+    Args:
+        blueprint: Master Blueprint entry (with a fully resolved preview
+            link).
+
+    Returns:
+        The letter subfolder the Blueprint is within.
+    """
+
+    return blueprint['preview'].removeprefix(f'{REPO_URL}/').split('/', 1)[0]
+
+
+def get_digest(content: bytes) -> str:
+    """
+    Get the hex SHA256 digest of the given content.
+
+    Args:
+        content: Bytes to hash.
+
+    Returns:
+        Hex digest of the content.
+    """
+
+    return sha256(content).hexdigest()
+
+
+def write_if_changed(file: Path, content: Union[str, bytes]) -> bool:
+    """
+    Atomically write the given content to the file, skipping the write
+    if the file already has identical content.
+
+    Args:
+        file: Path to the file to write.
+        content: Text or bytes to write into the file.
+
+    Returns:
+        Whether the file was written.
+    """
+
+    data = content.encode() if isinstance(content, str) else content
+
+    # Skip if content is unchanged
+    try:
+        if file.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+
+    # Write to temporary file in the same directory, then move in place
+    file.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile(
+            'wb', dir=file.parent, prefix=f'.{file.name}.', delete=False
+        ) as file_handle:
+        file_handle.write(data)
+        temp_file = Path(file_handle.name)
+
+    try:
+        temp_file.chmod(0o644)
+        replace_file(temp_file, file)
+    except OSError:
+        temp_file.unlink(missing_ok=True)
+        raise
+
+    return True
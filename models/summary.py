@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True, slots=True)
+class BlueprintSummary:
+    """
+    Lightweight summary of the fields of a Blueprint which are needed
+    to build the READMEs and master files, without materializing the
+    full Blueprint model.
+    """
+
+    series_full_name: str
+    id: int
+    preview: str
+    creator: str
+    created: Optional[str]
+    card_type: Optional[str]
+    template_count: int
+    font_count: int
+    episode_count: int
+
+    @classmethod
+    def from_blueprint(cls,
+            series_full_name: str,
+            blueprint_id: int,
+            blueprint: dict,
+        ) -> 'BlueprintSummary':
+        """Summarize the given parsed Blueprint."""
+
+        return cls(
+            series_full_name=series_full_name,
+            id=blueprint_id,
+            preview=blueprint['preview'],
+            creator=blueprint['creator'],
+            created=blueprint.get('created'),
+            card_type=(blueprint.get('series') or {}).get('card_type'),
+            template_count=len(blueprint.get('templates', [])),
+            font_count=len(blueprint.get('fonts', [])),
+            episode_count=len(blueprint.get('episodes', [])),
+        )
+
+    @classmethod
+    def from_master(cls, blueprint: dict) -> 'BlueprintSummary':
+        """Summarize the given master Blueprint entry."""
+
+        return cls.from_blueprint(
+            blueprint['series_full_name'], blueprint['id'], blueprint
+        )
+
+    @property
+    def creators(self) -> list[str]:
+        """All (comma-separated) creators of this Blueprint."""
+
+        return [creator.strip() for creator in self.creator.split(',')]
+
+
+def summarize_series(
+        series_full_name: str,
+        blueprints: list[Optional[dict]],
+    ) -> list[Optional[BlueprintSummary]]:
+    """
+    Summarize all Blueprints of a Series (as written in the Series
+    blueprints.json file), keeping null in place of any missing IDs.
+    """
+
+    return [
+        None if blueprint is None
+        else BlueprintSummary.from_blueprint(series_full_name, blueprint_id, blueprint)
+        for blueprint_id, blueprint in enumerate(blueprints)
+    ]
@@ -0,0 +1,200 @@
+"""
+Validation engine for Blueprint files.
+
+All Blueprints are parsed and validated against the `Blueprint` model
+across a process pool, and the result of each file is cached by the
+hash of the file (and of the models) so that unchanged Blueprints are
+not validated again. Every error of every Blueprint is reported, rather
+than stopping at the first failure.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha256
+from json import JSONDecodeError
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+from pydantic import ValidationError
+
+from build.utils import loads, minify_json, write_if_changed
+from models.models import Blueprint
+
+
+ROOT = Path(__file__).parent.parent
+BLUEPRINT_FOLDER = ROOT / 'blueprints'
+VALIDATION_CACHE = ROOT / '.validation_cache.json'
+MODELS_FILE = Path(__file__).parent / 'models.py'
+
+# Minimum number of files to validate before a process pool is used
+PARALLEL_THRESHOLD = 64
+
+
+class ValidationIssue(NamedTuple):
+    file: str
+    field: str
+    error: str
+
+    def __str__(self) -> str:
+        return f'{self.file} [{self.field}]: {self.error}'
+
+
+class ValidationReport(NamedTuple):
+    issues: list[ValidationIssue]
+    validated: int
+    cached: int
+
+    @property
+    def passed(self) -> bool:
+        return not self.issues
+
+    def format(self) -> str:
+        """Format this report as a human-readable summary."""
+
+        lines = [
+            f'Validated {self.validated} Blueprint(s) ({self.cached} cached), '
+            f'found {len(self.issues)} issue(s)'
+        ]
+        lines.extend(str(issue) for issue in self.issues)
+
+        return '\n'.join(lines)
+
+
+def validate_blueprint(blueprint: object) -> list[tuple[str, str]]:
+    """
+    Validate the given parsed Blueprint.
+
+    Args:
+        blueprint: Parsed Blueprint JSON to validate.
+
+    Returns:
+        List of field paths and error messages for every error of the
+        Blueprint. An empty list means the Blueprint is valid.
+    """
+
+    if not isinstance(blueprint, dict):
+        return [('__root__', 'Blueprint files must be a single Blueprint')]
+
+    try:
+        Blueprint(**blueprint)
+    except ValidationError as exc:
+        return [
+            ('.'.join(map(str, error['loc'])), error['msg'])
+            for error in exc.errors()
+        ]
+
+    return []
+
+
+def validate_blueprint_content(content: bytes) -> list[tuple[str, str]]:
+    """
+    Parse and validate the given raw content of a Blueprint file.
+
+    Args:
+        content: Content of the blueprint.json file.
+
+    Returns:
+        List of field paths and error messages for every error of the
+        Blueprint.
+    """
+
+    try:
+        blueprint = loads(content)
+    except (JSONDecodeError, UnicodeDecodeError) as exc:
+        return [('__root__', f'Invalid JSON - {exc}')]
+
+    return validate_blueprint(blueprint)
+
+
+def get_file_key(file: Path) -> str:
+    """Get the key (and reported name) of the given file."""
+
+    try:
+        return file.relative_to(ROOT).as_posix()
+    except ValueError:
+        return file.as_posix()
+
+
+def _read_cache(cache_file: Path, models_digest: str) -> dict[str, dict]:
+    """Read the cached results, discarding them if the models changed."""
+
+    try:
+        cache = loads(cache_file.read_bytes())
+    except (FileNotFoundError, JSONDecodeError):
+        return {}
+
+    if cache.get('models') != models_digest:
+        return {}
+
+    return cache.get('results', {})
+
+
+def validate_blueprints(
+        files: Optional[Iterable[Path]] = None,
+        *,
+        workers: Optional[int] = None,
+        use_cache: bool = True,
+        cache_file: Path = VALIDATION_CACHE,
+    ) -> ValidationReport:
+    """
+    Validate all the given Blueprint files.
+
+    Args:
+        files: Blueprint files to validate. If omitted, all Blueprints
+            in the repository are validated.
+        workers: Number of worker processes to use.
+        use_cache: Whether to skip files whose results are cached.
+        cache_file: File to cache the results in. Only the results of
+            the files validated by the latest call are kept.
+
+    Returns:
+        Report of all validation issues.
+    """
+
+    if files is None:
+        files = sorted(BLUEPRINT_FOLDER.glob('*/*/*/blueprint.json'))
+
+    models_digest = sha256(MODELS_FILE.read_bytes()).hexdigest()
+    cache = _read_cache(cache_file, models_digest) if use_cache else {}
+
+    # Determine which files have changed since they were last validated
+    results: dict[str, dict] = {}
+    pending: dict[str, tuple[str, bytes]] = {}
+    for file in files:
+        key = get_file_key(file)
+        content = file.read_bytes()
+        digest = sha256(content).hexdigest()
+        if (cached := cache.get(key)) and cached['digest'] == digest:
+            results[key] = cached
+        else:
+            pending[key] = (digest, content)
+    cached_count = len(results)
+
+    # Validate all changed files, in parallel if there are many
+    contents = [content for _, content in pending.values()]
+    if len(pending) >= PARALLEL_THRESHOLD and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            errors = list(executor.map(
+                validate_blueprint_content, contents, chunksize=16
+            ))
+    else:
+        errors = list(map(validate_blueprint_content, contents))
+
+    for (key, (digest, _)), file_errors in zip(pending.items(), errors):
+        results[key] = {'digest': digest, 'errors': file_errors}
+
+    # Update cache, dropping any files which were not validated
+    if use_cache:
+        write_if_changed(cache_file, minify_json(
+            {'models': models_digest, 'results': dict(sorted(results.items()))},
+            stable=False,
+        ))
+
+    return ValidationReport(
+        issues=[
+            ValidationIssue(key, field, error)
+            for key, result in results.items()
+            for field, error in result['errors']
+        ],
+        validated=len(results),
+        cached=cached_count,
+    )
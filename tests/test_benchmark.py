@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip('PIL')
+pytest.importorskip('imagesize')
+
+from build.benchmark import Benchmark, generate_tree, run_benchmark
+from build.utils import read_json
+
+STAGES = {
+    'glob', 'json_parse', 'validation', 'series_aggregation',
+    'master_aggregation', 'statistics', 'readme_rendering',
+    'image_normalization', 'build_all_full', 'build_all_incremental',
+}
+
+
+class TestBenchmark:
+    def test_generated_tree_layout(self, tmp_path):
+        generate_tree(tmp_path, 20, 0)
+        assert len(list(tmp_path.glob('*/*/*/blueprint.json'))) == 20
+
+    def test_all_stages_timed(self, tmp_path):
+        generate_tree(tmp_path / 'blueprints', 20, 1)
+        benchmark = Benchmark(tmp_path / 'profiles')
+        run_benchmark(tmp_path / 'blueprints', benchmark, 1)
+
+        assert set(benchmark.stages) == STAGES
+        assert all(stage['peak_memory'] is not None for stage in benchmark.stages.values())
+        assert len(list((tmp_path / 'profiles').glob('*.prof'))) == len(STAGES)
+        assert len(read_json(tmp_path / 'master_blueprints.json')) == 20
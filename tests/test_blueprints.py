@@ -1,54 +1,25 @@
-from json import load as json_load, JSONDecodeError
+from functools import cache
 from pathlib import Path
 
-from re import compile as re_compile, sub as re_sub, IGNORECASE
-from typing import Iterator
+from re import compile as re_compile
 
-from models.models import Blueprint
-
-BLUEPRINT_FOLDER = Path(__file__).parent.parent / 'blueprints'
+from build.build_master_blueprint import build_master_entries
+from build.font_store import build_font_store, get_font_hashes
+from build.utils import BLUEPRINT_FOLDER, get_blueprint_folders, read_json
+from models.validation import validate_blueprints
 
 # Non-tests
 
-def read_blueprints() -> Iterator[tuple[Path, str, dict]]:
+@cache
+def read_blueprints() -> tuple[tuple[Path, str, dict], ...]:
+    blueprints = []
     for blueprint_file in BLUEPRINT_FOLDER.glob('*/*/*/blueprint.json'):
         blueprint_id = blueprint_file.parent
         series_subfolder = blueprint_file.parent.parent
-        with blueprint_file.open('r') as file_handle:
-            blueprint = json_load(file_handle)
-            yield series_subfolder, blueprint_id, blueprint
-
-    return None
-
-PATH_SAFE_TRANSLATION = str.maketrans({
-    '?': '!',
-    '<': '',
-    '>': '',
-    ':':' -',
-    '"': '',
-    '|': '',
-    '*': '-',
-    '/': '+',
-    '\\': '+',
-})
-
-
-def get_blueprint_folders(series_name: str) -> tuple[str, str]:
-    """
-    Get the path-safe name for the given Series name.
+        blueprint = read_json(blueprint_file)
+        blueprints.append((series_subfolder, blueprint_id, blueprint))
 
-    Args:
-        series_name: Name of the Series.
-
-    Returns:
-        Path-safe name with prefix a/an/the and any illegal characters
-        (e.g. '?', '|', '/', etc.) removed.
-    """
-
-    clean_name = str(series_name).translate(PATH_SAFE_TRANSLATION)
-    sort_name = re_sub(r'^(a|an|the)(\s)', '', clean_name, flags=IGNORECASE)
-
-    return sort_name[0].upper(), clean_name
+    return tuple(blueprints)
 
 # Tests
 
@@ -88,19 +59,13 @@ class TestFolderOrganization:
 class TestBlueprintModels:
     def test_blueprint_is_valid_json(self):
         for file in BLUEPRINT_FOLDER.glob('*/*/*/blueprint.json'):
-            content = None
-            with file.open('r') as file_handle:
-                try:
-                    content = json_load(file_handle)
-                except JSONDecodeError:
-                    pass
-
+            content = read_json(file)
             assert content is not None, 'All Series must have an associated blueprint.json file'
             assert isinstance(content, dict), 'All blueprint files must have be a single Blueprint'
 
     def test_blueprint_is_valid_model(self):
-        for _, _, blueprint in read_blueprints():
-            assert Blueprint(**blueprint), blueprint
+        report = validate_blueprints()
+        assert report.passed, report.format()
 
 
 class TestBlueprintFiles:
@@ -120,3 +85,17 @@ class TestBlueprintFiles:
             }
             assert len(given_files - font_files - {blueprint['preview']}) == 0, 'Only files listed in the blueprint can be included in the blueprint folder'
             assert len((font_files | {blueprint['preview']}) - given_files) == 0, 'All files listed in the blueprint must be included in the blueprint folder'
+
+    def test_font_store_identifies_all_fonts(self):
+        all_blueprints = []
+        for series_subfolder, blueprint_folder, blueprint in read_blueprints():
+            all_blueprints.append(build_master_entries(
+                series_subfolder, [None] * int(blueprint_folder.name) + [blueprint]
+            )[0])
+
+        font_store = build_font_store(all_blueprints)
+        for blueprint in all_blueprints:
+            font_hashes = get_font_hashes(font_store, blueprint)
+            for font, font_hash in zip(blueprint.get('fonts', []), font_hashes):
+                if font.get('file') is not None:
+                    assert font_hash in font_store['fonts'], 'All Font files must be in the font store'
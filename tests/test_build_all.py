@@ -0,0 +1,208 @@
+from pathlib import Path
+from shutil import copytree, ignore_patterns, rmtree
+from subprocess import run
+from sys import executable
+
+import pytest
+
+from build.manifest import BuildManifest
+from build.utils import ROOT, format_json, read_json
+
+
+def make_blueprint(creator: str = 'Creator') -> dict:
+    return {
+        'series': {'font_id': 0, 'template_ids': []},
+        'episodes': {},
+        'templates': [],
+        'fonts': [{'name': 'Font', 'file': 'font.ttf'}],
+        'preview': 'preview.jpg',
+        'creator': creator,
+        'description': ['Test Blueprint.'],
+        'created': '2023-01-01T00:00:00',
+    }
+
+
+def write_blueprint(root: Path, series: str, blueprint_id: int, **kwargs) -> Path:
+    folder = root / 'blueprints' / series[0] / series / str(blueprint_id)
+    folder.mkdir(parents=True, exist_ok=True)
+    (folder / 'blueprint.json').write_text(format_json(make_blueprint(**kwargs)))
+    (folder / 'font.ttf').write_bytes(f'{series} font'.encode())
+    (folder / 'preview.jpg').write_bytes(b'')
+
+    return folder
+
+
+def build(root: Path, full: bool = False, *args: str) -> None:
+    run(
+        [executable, '-m', 'build.build_all', *(['--full'] if full else []), *args],
+        cwd=root, check=True, capture_output=True,
+    )
+
+
+def snapshot(root: Path) -> dict[str, bytes]:
+    """Get the content of all (non-hidden) files outside the packages."""
+
+    return {
+        file.relative_to(root).as_posix(): file.read_bytes()
+        for file in root.rglob('*')
+        if (file.is_file()
+            and file.relative_to(root).parts[0] not in ('build', 'models')
+            and not file.name.startswith('.'))
+    }
+
+
+def assert_matches_full_build(root: Path) -> None:
+    incremental = snapshot(root)
+    build(root, full=True)
+    assert snapshot(root) == incremental
+
+
+@pytest.fixture
+def tree(tmp_path) -> Path:
+    """Copy of the build packages with a small, already built, tree."""
+
+    for package in ('build', 'models'):
+        copytree(ROOT / package, tmp_path / package, ignore=ignore_patterns('__pycache__'))
+    write_blueprint(tmp_path, 'Alpha (2020)', 0)
+    write_blueprint(tmp_path, 'Alpha (2020)', 1, creator='Other')
+    write_blueprint(tmp_path, 'Beta (2021)', 0)
+    build(tmp_path)
+
+    return tmp_path
+
+
+class TestIncrementalBuild:
+    def test_unchanged_build_writes_nothing(self, tree):
+        before = snapshot(tree)
+        build(tree)
+        assert snapshot(tree) == before
+        assert len(read_json(tree / 'master_blueprints.json')) == 3
+
+    def test_blueprint_added(self, tree):
+        write_blueprint(tree, 'Beta (2021)', 1, creator='New')
+        build(tree)
+        assert len(read_json(tree / 'master_blueprints.json')) == 4
+        assert_matches_full_build(tree)
+
+    def test_series_added(self, tree):
+        write_blueprint(tree, 'Gamma (2022)', 0)
+        build(tree)
+        assert (tree / 'blueprints' / 'G' / 'Gamma (2022)' / 'README.md').exists()
+        assert_matches_full_build(tree)
+
+    def test_blueprint_edited(self, tree):
+        write_blueprint(tree, 'Alpha (2020)', 0, creator='Edited')
+        build(tree)
+        assert 'Edited' in (tree / 'README.md').read_text()
+        assert_matches_full_build(tree)
+
+    def test_blueprint_deleted(self, tree):
+        rmtree(tree / 'blueprints' / 'A' / 'Alpha (2020)' / '0')
+        build(tree)
+        assert read_json(tree / 'blueprints' / 'A' / 'Alpha (2020)' / 'blueprints.json')[0] is None
+        assert_matches_full_build(tree)
+
+    def test_series_deleted(self, tree):
+        rmtree(tree / 'blueprints' / 'B')
+        build(tree)
+        assert {
+            blueprint['series_full_name']
+            for blueprint in read_json(tree / 'master_blueprints.json')
+        } == {'Alpha (2020)'}
+        assert_matches_full_build(tree)
+
+    def test_font_edited(self, tree):
+        font_store = (tree / 'catalog' / 'fonts.json').read_bytes()
+        with (tree / 'blueprints' / 'A' / 'Alpha (2020)' / '0' / 'font.ttf').open('ab') as file_handle:
+            file_handle.write(b'\0')
+        build(tree)
+        assert (tree / 'catalog' / 'fonts.json').read_bytes() != font_store
+        assert_matches_full_build(tree)
+
+    def test_readme_leaderboard_size(self, tree):
+        build(tree, False, '--top', '1')
+        assert '| Alpha (2020) | 2 |\n\nCreators' in (tree / 'README.md').read_text()
+        build(tree)
+        assert '| Beta (2021) | 1 |\n| - | - |' in (tree / 'README.md').read_text()
+
+    @pytest.mark.parametrize('output', [
+        'blueprints/A/Alpha (2020)/README.md',
+        'blueprints/A/Alpha (2020)/blueprints.json',
+        'master_blueprints.json',
+        'catalog/index.json',
+        'catalog/index.json.gz',
+        'catalog/fonts.json',
+        'catalog/fonts.json.gz',
+        'catalog/master_blueprints.json',
+        'catalog/master_blueprints.json.gz',
+        'catalog/shards/B.json',
+        'catalog/shards/B.json.gz',
+        'catalog/search_index.json',
+    ])
+    def test_output_missing(self, tree, output):
+        expected = (tree / output).read_bytes()
+        (tree / output).unlink()
+        build(tree)
+        assert (tree / output).read_bytes() == expected
+        assert_matches_full_build(tree)
+
+    def test_corrupt_index_repaired(self, tree):
+        expected = (tree / 'catalog' / 'index.json').read_bytes()
+        (tree / 'catalog' / 'index.json').write_text('garbage')
+        build(tree)
+        assert (tree / 'catalog' / 'index.json').read_bytes() == expected
+        assert_matches_full_build(tree)
+
+
+class TestBuildManifest:
+    def test_manifest_only_records_digests(self, tmp_path):
+        folder = write_blueprint(tmp_path, 'Alpha (2020)', 0)
+        blueprint_file = folder / 'blueprint.json'
+        manifest = BuildManifest(
+            tmp_path / 'manifest.json', tmp_path / 'cache.json', tmp_path / 'blueprints'
+        )
+        manifest.record(
+            blueprint_file, manifest.hash_file(blueprint_file),
+            manifest.hash_fonts(blueprint_file),
+        )
+        assert manifest.save()
+
+        assert read_json(tmp_path / 'manifest.json')['blueprints'] == {
+            'A/Alpha (2020)/0': {
+                'digest': manifest.hash_file(blueprint_file),
+                'fonts': {'font.ttf': manifest.hash_file(folder / 'font.ttf')},
+            },
+        }
+
+    def test_touched_file_does_not_rewrite_manifest(self, tmp_path):
+        folder = write_blueprint(tmp_path, 'Alpha (2020)', 0)
+        blueprint_file = folder / 'blueprint.json'
+        files = (tmp_path / 'manifest.json', tmp_path / 'cache.json', tmp_path / 'blueprints')
+        manifest = BuildManifest(*files)
+        manifest.record(blueprint_file, manifest.hash_file(blueprint_file))
+        manifest.save()
+
+        blueprint_file.touch()
+        manifest = BuildManifest(*files)
+        assert manifest.file_cache.lookup(blueprint_file) is None
+        manifest.record(blueprint_file, manifest.hash_file(blueprint_file))
+        assert not manifest.digests_changed
+        assert not manifest.save()
+
+        # Unchanged file is not re-hashed
+        assert BuildManifest(*files).file_cache.lookup(blueprint_file) == manifest.entries['A/Alpha (2020)/0']['digest']
+
+    def test_removed(self, tmp_path):
+        files = (tmp_path / 'manifest.json', None, tmp_path / 'blueprints')
+        for blueprint_id in range(2):
+            write_blueprint(tmp_path, 'Alpha (2020)', blueprint_id)
+        manifest = BuildManifest(*files)
+        for blueprint_file in (tmp_path / 'blueprints').glob('*/*/*/blueprint.json'):
+            manifest.record(blueprint_file, manifest.hash_file(blueprint_file))
+        manifest.save()
+
+        manifest = BuildManifest(*files)
+        blueprint_file = tmp_path / 'blueprints' / 'A' / 'Alpha (2020)' / '0' / 'blueprint.json'
+        manifest.record(blueprint_file, manifest.hash_file(blueprint_file))
+        assert manifest.removed == {'A/Alpha (2020)/1'}
+        assert manifest.digests_changed
@@ -0,0 +1,75 @@
+from gzip import decompress
+
+from build.build_catalog import build_catalog
+from build.utils import REPO_URL, read_json
+
+FONT_STORE = {'fonts': {}, 'blueprints': {}, 'total_files': 0, 'total_size': 0, 'unique_size': 0}
+
+
+def make_entry(series_full_name: str, blueprint_id: int, creator: str = 'Creator') -> dict:
+    return {
+        'series': {'card_type': 'standard'},
+        'fonts': [],
+        'preview': f'{REPO_URL}/{series_full_name[0]}/{series_full_name}/{blueprint_id}/preview.jpg',
+        'creator': creator,
+        'created': '2023-01-01T00:00:00',
+        'series_full_name': series_full_name,
+        'id': blueprint_id,
+    }
+
+
+ALL_BLUEPRINTS = [
+    make_entry('Alpha (2020)', 0),
+    make_entry('Alpha (2020)', 1),
+    make_entry('Another (2019)', 0),
+    make_entry('Beta (2021)', 0),
+]
+
+
+class TestBuildCatalog:
+    def test_shards_split_per_letter(self, tmp_path):
+        build_catalog(ALL_BLUEPRINTS, FONT_STORE, tmp_path)
+
+        assert read_json(tmp_path / 'shards' / 'A.json') == ALL_BLUEPRINTS[:3]
+        assert read_json(tmp_path / 'shards' / 'B.json') == ALL_BLUEPRINTS[3:]
+        index = read_json(tmp_path / 'index.json')
+        assert index['blueprint_count'] == 4
+        assert set(index['shards']) == {'A', 'B'}
+        assert {name: series['shard'] for name, series in index['series'].items()} == {
+            'Alpha (2020)': 'A', 'Another (2019)': 'A', 'Beta (2021)': 'B',
+        }
+        assert [blueprint['id'] for blueprint in index['series']['Alpha (2020)']['blueprints']] == [0, 1]
+
+    def test_stale_shards_deleted(self, tmp_path):
+        build_catalog(ALL_BLUEPRINTS, FONT_STORE, tmp_path)
+        build_catalog(ALL_BLUEPRINTS[:3], FONT_STORE, tmp_path)
+
+        assert sorted(file.name for file in (tmp_path / 'shards').iterdir()) == ['A.json', 'A.json.gz']
+        assert set(read_json(tmp_path / 'index.json')['shards']) == {'A'}
+
+    def test_versions_only_change_with_content(self, tmp_path):
+        assert build_catalog(ALL_BLUEPRINTS, FONT_STORE, tmp_path) > 0
+        index = read_json(tmp_path / 'index.json')
+        assert build_catalog(ALL_BLUEPRINTS, FONT_STORE, tmp_path) == 0
+        assert read_json(tmp_path / 'index.json') == index
+
+        build_catalog(
+            [make_entry('Alpha (2020)', 0, 'Edited'), *ALL_BLUEPRINTS[1:]],
+            FONT_STORE, tmp_path,
+        )
+        new_index = read_json(tmp_path / 'index.json')
+        assert new_index['version'] != index['version']
+        assert new_index['shards']['A'] != index['shards']['A']
+        assert new_index['shards']['B'] == index['shards']['B']
+        assert new_index['fonts'] == index['fonts']
+
+    def test_gzip_is_deterministic(self, tmp_path):
+        build_catalog(ALL_BLUEPRINTS, FONT_STORE, tmp_path / 'first')
+        build_catalog(ALL_BLUEPRINTS, FONT_STORE, tmp_path / 'second')
+
+        gzipped = sorted((tmp_path / 'first').rglob('*.gz'))
+        assert len(gzipped) == 5
+        for file in gzipped:
+            second = tmp_path / 'second' / file.relative_to(tmp_path / 'first')
+            assert file.read_bytes() == second.read_bytes()
+            assert decompress(file.read_bytes()) == file.with_suffix('').read_bytes()
@@ -0,0 +1,63 @@
+from build.font_store import build_font_store, get_font_hashes
+from build.utils import REPO_URL, get_digest
+
+
+def make_entry(series_full_name: str, blueprint_id: int, fonts: list[dict]) -> dict:
+    return {
+        'series_full_name': series_full_name,
+        'id': blueprint_id,
+        'preview': f'{REPO_URL}/{series_full_name[0]}/{series_full_name}/{blueprint_id}/preview.jpg',
+        'fonts': fonts,
+    }
+
+
+class TestFontStore:
+    def test_identical_fonts_are_stored_once(self, tmp_path):
+        all_blueprints = [
+            make_entry('Alpha (2020)', 0, [{'file': 'a.ttf'}]),
+            make_entry('Beta (2021)', 3, [{'file': 'b.ttf'}, {'file': 'c.ttf'}]),
+        ]
+        for entry, file, content in (
+                (all_blueprints[0], 'a.ttf', b'shared'),
+                (all_blueprints[1], 'b.ttf', b'shared'),
+                (all_blueprints[1], 'c.ttf', b'unique')):
+            folder = tmp_path / entry['series_full_name'][0] / entry['series_full_name'] / str(entry['id'])
+            folder.mkdir(parents=True, exist_ok=True)
+            (folder / file).write_bytes(content)
+
+        font_store = build_font_store(all_blueprints, tmp_path)
+
+        shared = get_digest(b'shared')
+        assert set(font_store['fonts']) == {shared, get_digest(b'unique')}
+        assert font_store['fonts'][shared] == {
+            'file': 'a.ttf',
+            'url': f'{REPO_URL}/A/Alpha (2020)/0/a.ttf',
+            'size': 6,
+            'count': 2,
+        }
+        assert font_store['total_files'] == 3
+        assert font_store['total_size'] == 18
+        assert font_store['unique_size'] == 12
+        assert get_font_hashes(font_store, all_blueprints[1]) == [shared, get_digest(b'unique')]
+
+    def test_fonts_without_files(self, tmp_path):
+        entry = make_entry('Alpha (2020)', 0, [{'name': 'Font'}, {'file': 'missing.ttf'}])
+
+        font_store = build_font_store([entry], tmp_path)
+
+        assert font_store['fonts'] == {}
+        assert font_store['blueprints'] == {}
+        assert get_font_hashes(font_store, entry) == [None, None]
+
+    def test_known_files_are_not_read(self, tmp_path):
+        entry = make_entry('Alpha (2020)', 0, [{'file': 'a.ttf'}, {'file': 'b.ttf'}])
+        folder = tmp_path / 'A' / 'Alpha (2020)' / '0'
+        folder.mkdir(parents=True)
+        (folder / 'b.ttf').write_bytes(b'unknown')
+
+        font_store = build_font_store(
+            [entry], tmp_path, {'A/Alpha (2020)/0/a.ttf': {'digest': 'known', 'size': 10}},
+        )
+
+        assert font_store['fonts']['known']['size'] == 10
+        assert get_font_hashes(font_store, entry) == ['known', get_digest(b'unknown')]
@@ -0,0 +1,177 @@
+from functools import partial
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps, loads
+from threading import Thread
+from zipfile import ZIP_DEFLATED, ZipFile
+
+import pytest
+
+pytest.importorskip('requests')
+
+from build.parse_submission import (
+    HttpFetcher, LocalFetcher, SubmissionError, create_blueprint,
+    extract_font_zip, parse_issue, process_batch, write_step_summary,
+)
+
+BLUEPRINT = {
+    'series': {'font_id': 0, 'template_ids': []},
+    'fonts': [{'name': 'Font', 'file': 'font.ttf'}],
+}
+
+ISSUE_BODY = """### Series Name
+
+The Test Series
+
+### Series Year
+
+2020
+
+### Creator Username
+
+_No response_
+
+### Blueprint Description
+
+A description.
+
+### Blueprint
+
+```json
+{blueprint}
+```
+
+### Preview Title Card
+
+![image](https://github.com/user-attachments/preview.jpg)
+
+### Zip of Font Files
+
+[fonts.zip](https://github.com/user-attachments/fonts.zip)
+"""
+
+
+@pytest.fixture
+def assets(tmp_path):
+    folder = tmp_path / 'assets'
+    folder.mkdir()
+    (folder / 'preview.jpg').write_bytes(b'\xff\xd8' + b'0' * 1024)
+    with ZipFile(folder / 'fonts.zip', 'w') as archive:
+        archive.writestr('font.ttf', b'font')
+        archive.writestr('__MACOSX/font.ttf', b'metadata')
+    return folder
+
+
+@pytest.fixture
+def server(assets):
+    handler = partial(SimpleHTTPRequestHandler, directory=str(assets))
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}/'
+    httpd.shutdown()
+
+
+class TestParseSubmission:
+    def test_parse_issue(self):
+        submission = parse_issue(ISSUE_BODY.format(blueprint=dumps(BLUEPRINT)), 'Author')
+        assert submission.series_name == 'The Test Series'
+        assert submission.creator == 'Author'
+        assert submission.blueprint == BLUEPRINT
+        assert submission.font_zip_url.endswith('fonts.zip')
+
+    def test_invalid_blueprint_json(self):
+        with pytest.raises(SubmissionError):
+            parse_issue(ISSUE_BODY.format(blueprint='{'))
+
+    def test_create_blueprint_from_local_server(self, tmp_path, server):
+        fetcher = HttpFetcher({'https://github.com/user-attachments/': server})
+        submission = parse_issue(ISSUE_BODY.format(blueprint=dumps(BLUEPRINT)))
+
+        folder = create_blueprint(submission, fetcher, tmp_path / 'blueprints')
+        assert folder == tmp_path / 'blueprints' / 'T' / 'The Test Series (2020)' / '0'
+        assert {file.name for file in folder.iterdir()} == {
+            'blueprint.json', 'preview.jpg', 'font.ttf'
+        }
+        assert loads((folder / 'blueprint.json').read_text())['creator'] == 'CollinHeist'
+
+    def test_download_size_limit(self, tmp_path, server):
+        fetcher = HttpFetcher()
+        with pytest.raises(SubmissionError):
+            fetcher.fetch(f'{server}preview.jpg', tmp_path / 'preview.jpg', 100)
+
+    def test_unsafe_zip_rejected(self, tmp_path):
+        zip_file = tmp_path / 'unsafe.zip'
+        with ZipFile(zip_file, 'w') as archive:
+            archive.writestr('../font.ttf', b'font')
+        with pytest.raises(SubmissionError):
+            extract_font_zip(zip_file, tmp_path)
+
+    def test_zip_size_checked_before_decompressing(self, tmp_path, monkeypatch):
+        zip_file = tmp_path / 'bomb.zip'
+        with ZipFile(zip_file, 'w', ZIP_DEFLATED) as archive:
+            archive.writestr('font.ttf', bytes(1024))
+        monkeypatch.setattr('build.parse_submission.MAX_UNZIPPED_SIZE', 100)
+        def testzip(self):
+            raise AssertionError('Zip decompressed before checking its size')
+        monkeypatch.setattr(ZipFile, 'testzip', testzip)
+        with pytest.raises(SubmissionError, match='larger than'):
+            extract_font_zip(zip_file, tmp_path)
+
+    def test_batch_claims_unique_ids(self, tmp_path, assets):
+        issue = dumps({'body': ISSUE_BODY.format(blueprint=dumps(BLUEPRINT))})
+        batch_file = tmp_path / 'batch.jsonl'
+        batch_file.write_text('\n'.join([issue, issue, issue, 'invalid']))
+
+        results = process_batch(
+            batch_file, LocalFetcher(assets), 3, tmp_path / 'blueprints'
+        )
+        assert sorted(folder.name for _, folder, error in results if error is None) == ['0', '1', '2']
+        assert results[-1][1] is None
+
+    def test_batch_records_unexpected_errors(self, tmp_path, assets):
+        (assets / 'folder.zip').mkdir()
+        body = ISSUE_BODY.format(blueprint=dumps(BLUEPRINT))
+        batch_file = tmp_path / 'batch.jsonl'
+        batch_file.write_text('\n'.join([
+            dumps({'body': body.replace('fonts.zip', 'folder.zip')}),
+            dumps({'body': body}),
+        ]))
+
+        results = process_batch(
+            batch_file, LocalFetcher(assets), 2, tmp_path / 'blueprints'
+        )
+        assert 'IsADirectoryError' in results[0][2]
+        assert results[1][2] is None
+        assert [folder.name for folder in (tmp_path / 'blueprints' / 'T' / 'The Test Series (2020)').iterdir()] == [results[1][1].name]
+
+    def test_invalid_content_length(self, tmp_path):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header('Content-Length', 'invalid')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        Thread(target=httpd.serve_forever, daemon=True).start()
+        try:
+            with pytest.raises(SubmissionError, match='Content-Length'):
+                HttpFetcher().fetch(
+                    f'http://127.0.0.1:{httpd.server_address[1]}/preview.jpg',
+                    tmp_path / 'preview.jpg', 100,
+                )
+        finally:
+            httpd.shutdown()
+
+    def test_invalid_blueprint_written_to_step_summary(self, tmp_path, monkeypatch):
+        summary_file = tmp_path / 'summary.md'
+        monkeypatch.setenv('GITHUB_STEP_SUMMARY', str(summary_file))
+        submission = parse_issue(ISSUE_BODY.format(blueprint=dumps({'fonts': [{'name': ''}]})))
+        with pytest.raises(SubmissionError) as exc_info:
+            create_blueprint(submission, LocalFetcher(tmp_path), tmp_path)
+        write_step_summary('Blueprint Submission Failed', str(exc_info.value))
+
+        summary = summary_file.read_text()
+        assert summary.startswith('## Blueprint Submission Failed')
+        assert '[fonts.0.name]' in summary
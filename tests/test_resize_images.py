@@ -0,0 +1,130 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('imagesize')
+Image = pytest.importorskip('PIL.Image')
+
+from build.resize_images import IMAGE_SIZE, THUMBNAIL_SIZE, normalize_preview, resize_images
+from build.utils import format_json
+
+RED, WHITE, BLACK = (255, 0, 0), (255, 255, 255), (0, 0, 0)
+
+
+def write_preview(file: Path, size: tuple[int, int] = (800, 600)) -> Path:
+    """Write a white preview with a red strip along the top."""
+
+    image = Image.new('RGB', size, WHITE)
+    image.paste(RED, (0, 0, size[0], size[1] // 12))
+    file.parent.mkdir(parents=True, exist_ok=True)
+    image.save(file, 'PNG')
+
+    return file
+
+
+def is_close(pixel: tuple[int, int, int], color: tuple[int, int, int]) -> bool:
+    return all(abs(channel - expected) < 16 for channel, expected in zip(pixel, color))
+
+
+@pytest.fixture
+def blueprint_folder(tmp_path) -> Path:
+    blueprint_folder = tmp_path / 'blueprints'
+    for series in ('Alpha (2020)', 'Beta (2021)'):
+        folder = blueprint_folder / series[0] / series / '0'
+        write_preview(folder / 'preview.png')
+        (folder / 'blueprint.json').write_text(format_json({'preview': 'preview.png'}))
+
+    return blueprint_folder
+
+
+class TestNormalizePreview:
+    def test_stretch(self, tmp_path):
+        preview = write_preview(tmp_path / 'preview.png')
+        result = normalize_preview(preview, 'stretch')
+
+        assert result.resized
+        with Image.open(preview) as image:
+            assert image.size == IMAGE_SIZE
+            assert is_close(image.getpixel((960, 0)), RED)
+            assert is_close(image.getpixel((0, 540)), WHITE)
+
+    def test_contain(self, tmp_path):
+        preview = write_preview(tmp_path / 'preview.png')
+        normalize_preview(preview, 'contain')
+
+        with Image.open(preview) as image:
+            assert image.size == IMAGE_SIZE
+            assert is_close(image.getpixel((960, 0)), RED)
+            assert is_close(image.getpixel((0, 540)), BLACK)
+
+    def test_cover(self, tmp_path):
+        preview = write_preview(tmp_path / 'preview.png')
+        normalize_preview(preview, 'cover')
+
+        with Image.open(preview) as image:
+            assert image.size == IMAGE_SIZE
+            assert is_close(image.getpixel((960, 0)), WHITE)
+            assert is_close(image.getpixel((0, 540)), WHITE)
+
+    def test_correct_size_not_resized(self, tmp_path):
+        preview = write_preview(tmp_path / 'preview.png', IMAGE_SIZE)
+        content = preview.read_bytes()
+
+        assert not normalize_preview(preview).resized
+        assert preview.read_bytes() == content
+
+    def test_derivatives(self, tmp_path):
+        preview = write_preview(tmp_path / 'preview.png')
+        result = normalize_preview(preview, derivative_subfolder=tmp_path / 'derivatives')
+
+        with Image.open(tmp_path / 'derivatives' / 'thumbnail.jpg') as image:
+            assert image.size == THUMBNAIL_SIZE
+        with Image.open(tmp_path / 'derivatives' / 'preview.webp') as image:
+            assert image.size == IMAGE_SIZE
+        assert result.derivative_bytes == sum(
+            file.stat().st_size for file in (tmp_path / 'derivatives').iterdir()
+        )
+
+
+class TestResizeImages:
+    def test_cached_previews_are_skipped(self, tmp_path, blueprint_folder, monkeypatch):
+        kwargs = {
+            'workers': 1, 'blueprint_folder': blueprint_folder,
+            'cache_file': tmp_path / 'preview_cache.json',
+            'file_cache_file': tmp_path / 'file_cache.json',
+        }
+
+        assert len(resize_images(**kwargs)) == 2
+
+        # Unchanged previews are not even read
+        with monkeypatch.context() as patch:
+            def get_digest(content):
+                raise AssertionError('Unchanged preview was hashed')
+            patch.setattr('build.manifest.get_digest', get_digest)
+            assert resize_images(**kwargs) == []
+
+        # Modified previews are normalized again
+        write_preview(blueprint_folder / 'A' / 'Alpha (2020)' / '0' / 'preview.png')
+        assert [result.preview.parent.parent.name for result in resize_images(**kwargs)] == ['Alpha (2020)']
+
+    def test_derivatives_are_written(self, tmp_path, blueprint_folder):
+        kwargs = {
+            'derivatives': True, 'workers': 1, 'blueprint_folder': blueprint_folder,
+            'cache_file': tmp_path / 'preview_cache.json',
+            'file_cache_file': tmp_path / 'file_cache.json',
+            'derivative_folder': tmp_path / 'previews',
+        }
+
+        assert len(resize_images(**kwargs)) == 2
+        assert sorted(
+            file.relative_to(tmp_path / 'previews').as_posix()
+            for file in (tmp_path / 'previews').rglob('*.*')
+        ) == [
+            'A/Alpha (2020)/0/preview.webp', 'A/Alpha (2020)/0/thumbnail.jpg',
+            'B/Beta (2021)/0/preview.webp', 'B/Beta (2021)/0/thumbnail.jpg',
+        ]
+        assert resize_images(**kwargs) == []
+
+        # Missing derivatives are written again
+        (tmp_path / 'previews' / 'B' / 'Beta (2021)' / '0' / 'thumbnail.jpg').unlink()
+        assert len(resize_images(**kwargs)) == 1
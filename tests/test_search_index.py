@@ -0,0 +1,50 @@
+from build.search_index import SearchIndex, get_series_tokens, write_search_index
+
+BLUEPRINTS = [
+    {
+        'series_full_name': 'The Big Bang Theory (2007)',
+        'id': 0,
+        'creator': 'CollinHeist, Someone_Else',
+        'series': {'card_type': 'standard', 'font_id': 0},
+        'templates': [
+            {'name': 'Absolute', 'filters': [{'argument': 'Absolute Number'}]}
+        ],
+        'fonts': [{'name': 'Big Bang', 'file': 'BigBang Regular.ttf'}],
+    },
+    {
+        'series_full_name': 'Pokémon (1997)',
+        'id': 1,
+        'creator': 'CollinHeist',
+        'series': {'card_type': 'anime'},
+        'episodes': {'s1e1': {'card_type': 'tinted frame'}},
+    },
+]
+
+
+def get_index(tmp_path) -> SearchIndex:
+    file = tmp_path / 'search_index.json'
+    write_search_index(BLUEPRINTS, file)
+    return SearchIndex(file)
+
+
+class TestSearchIndex:
+    def test_series_tokens_strip_prefix(self):
+        assert 'bigbangtheory' in get_series_tokens('The Big Bang Theory (2007)')
+
+    def test_prefix_search(self, tmp_path):
+        index = get_index(tmp_path)
+        assert index.search('bigb') == [('The Big Bang Theory (2007)', 0)]
+        assert index.search('poke') == [('Pokémon (1997)', 1)]
+
+    def test_all_tokens_must_match(self, tmp_path):
+        index = get_index(tmp_path)
+        assert len(index.search('collinheist')) == 2
+        assert index.search('collinheist anime') == [('Pokémon (1997)', 1)]
+        assert index.search('collinheist missing') == []
+
+    def test_field_search(self, tmp_path):
+        index = get_index(tmp_path)
+        assert index.search('tinted', field='card_type') == [('Pokémon (1997)', 1)]
+        assert index.search('absolute', field='filter') == [('The Big Bang Theory (2007)', 0)]
+        assert index.search('else', field='creator') == [('The Big Bang Theory (2007)', 0)]
+        assert index.search('anime', field='font') == []
@@ -0,0 +1,81 @@
+from build.blueprint_statistics import StatisticsCache
+from build.build_master_readme import build_master_readme
+from build.utils import REPO_URL
+
+
+def make_blueprint(creator, card_type='standard', created='2023-05-01T00:00:00', fonts=()):
+    return {
+        'preview': 'preview.jpg', 'creator': creator, 'created': created,
+        'series': {'card_type': card_type},
+        'fonts': [{'name': font} for font in fonts],
+    }
+
+
+class TestStatisticsCache:
+    def test_aggregates(self):
+        statistics = StatisticsCache(None)
+        statistics.update('A/A (2020)/0', 'A (2020)', 0, make_blueprint('X, Y', fonts=['F']))
+        statistics.update('A/A (2020)/1', 'A (2020)', 1, make_blueprint('X', 'anime'))
+        statistics.update('B/B (2021)/0', 'B (2021)', 0, make_blueprint('Y', created=None))
+
+        assert statistics.blueprint_count == 3
+        assert statistics.aggregates['series'] == {'A (2020)': 2, 'B (2021)': 1}
+        assert statistics.aggregates['creators'] == {'X': 2, 'Y': 2}
+        assert statistics.aggregates['card_types'] == {'standard': 2, 'anime': 1}
+        assert statistics.aggregates['months'] == {'2023-05': 2}
+        assert statistics.aggregates['fonts'] == {'F': 1}
+
+    def test_incremental_update_and_remove(self):
+        statistics = StatisticsCache(None)
+        statistics.update('A/A (2020)/0', 'A (2020)', 0, make_blueprint('X'))
+        assert not statistics.update('A/A (2020)/0', 'A (2020)', 0, make_blueprint('X'))
+        assert statistics.update('A/A (2020)/0', 'A (2020)', 0, make_blueprint('Y'))
+        assert statistics.aggregates['creators'] == {'Y': 1}
+
+        assert statistics.remove('A/A (2020)/0')
+        assert not statistics.remove('A/A (2020)/0')
+        assert all(not counts for counts in statistics.aggregates.values())
+
+    def test_leaderboard(self):
+        statistics = StatisticsCache(None)
+        for index, creator in enumerate(('B', 'A', 'C', 'C')):
+            statistics.update(f'A/A (2020)/{index}', 'A (2020)', index, make_blueprint(creator))
+
+        assert statistics.leaderboard('creators') == [('C', 2), ('A', 1), ('B', 1)]
+        assert statistics.leaderboard('creators', 2) == [('C', 2), ('A', 1)]
+
+    def test_save_and_load(self, tmp_path):
+        file = tmp_path / 'statistics.json'
+        statistics = StatisticsCache(file)
+        statistics.update('A/A (2020)/0', 'A (2020)', 0, make_blueprint('X'))
+        assert statistics.save()
+        assert len(file.read_text().splitlines()) > 1
+
+        loaded = StatisticsCache(file)
+        assert loaded.rows == statistics.rows
+        assert loaded.aggregates == statistics.aggregates
+        assert loaded.get_summary('A/A (2020)/0') == statistics.get_summary('A/A (2020)/0')
+        assert not loaded.save()
+
+    def test_refresh_from_master(self):
+        entries = [
+            make_blueprint('X') | {
+                'series_full_name': f'{name} (2020)', 'id': 0,
+                'preview': f'{REPO_URL}/{name}/{name} (2020)/0/preview.jpg',
+            }
+            for name in ('A', 'B', 'C')
+        ]
+        statistics = StatisticsCache(None)
+        assert statistics.refresh_from_master(entries)
+        assert statistics.blueprint_count == 3
+        assert not statistics.refresh_from_master(entries)
+
+        assert statistics.refresh_from_master(entries[:1])
+        assert list(statistics.rows) == ['A/A (2020)/0']
+        assert statistics.aggregates['creators'] == {'X': 1}
+
+    def test_readme_pads_leaderboards(self):
+        statistics = StatisticsCache(None)
+        statistics.update('A/A (2020)/0', 'A (2020)', 0, make_blueprint('X'))
+        readme = build_master_readme(statistics, top_n=3)
+        assert '| A (2020) | 1 |\n| - | - |\n| - | - |' in readme
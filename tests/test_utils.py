@@ -0,0 +1,59 @@
+from json import dumps
+
+from build.utils import format_json, loads, minify_json, read_json, write_if_changed
+from models.summary import BlueprintSummary, summarize_series
+
+CONTENT = {'name': 'Pokémon', 'size': 1.1, 'ids': [0, 1], 'file': None}
+
+
+class TestJsonIO:
+    def test_stable_format_matches_stdlib(self):
+        assert format_json(CONTENT) == dumps(CONTENT, indent=2)
+        assert minify_json(CONTENT) == dumps(CONTENT, separators=(',', ':')).encode()
+
+    def test_fast_format_round_trips(self):
+        assert loads(format_json(CONTENT, stable=False)) == CONTENT
+        assert loads(minify_json(CONTENT, stable=False)) == CONTENT
+
+    def test_read_invalid_json(self, tmp_path):
+        file = tmp_path / 'invalid.json'
+        file.write_text('{')
+        assert read_json(file) is None
+
+
+class TestWriteIfChanged:
+    def test_writes_new_file(self, tmp_path):
+        file = tmp_path / 'folder' / 'file.json'
+        assert write_if_changed(file, '{}')
+        assert file.read_text() == '{}'
+        assert list(file.parent.iterdir()) == [file]
+
+    def test_skips_identical_content(self, tmp_path):
+        file = tmp_path / 'file.json'
+        write_if_changed(file, b'{}')
+        mtime_ns = file.stat().st_mtime_ns
+        assert not write_if_changed(file, '{}')
+        assert file.stat().st_mtime_ns == mtime_ns
+
+    def test_replaces_changed_content(self, tmp_path):
+        file = tmp_path / 'file.json'
+        write_if_changed(file, '{}')
+        assert write_if_changed(file, '[]')
+        assert file.read_text() == '[]'
+        assert list(tmp_path.iterdir()) == [file]
+
+
+class TestBlueprintSummary:
+    def test_summarize_series(self):
+        blueprint = {
+            'preview': 'preview.jpg', 'creator': 'A, B', 'fonts': [{}],
+            'episodes': {'s1e1': {}, 's1e2': {}}, 'series': {'card_type': 'anime'},
+        }
+        summaries = summarize_series('Series (2020)', [None, blueprint])
+        assert summaries[0] is None
+        assert summaries[1] == BlueprintSummary(
+            series_full_name='Series (2020)', id=1, preview='preview.jpg',
+            creator='A, B', created=None, card_type='anime', template_count=0,
+            font_count=1, episode_count=2,
+        )
+        assert summaries[1].creators == ['A', 'B']
@@ -0,0 +1,57 @@
+from json import dumps
+
+from build.utils import read_json
+from models.validation import validate_blueprint, validate_blueprints
+
+VALID_BLUEPRINT = {
+    'series': {'font_id': 0, 'template_ids': []},
+    'fonts': [{'name': 'Font', 'file': 'font.ttf'}],
+    'creator': 'CollinHeist',
+    'preview': 'preview.jpg',
+    'description': ['Description'],
+    'created': '2023-08-06T00:00:00',
+}
+
+
+class TestValidationEngine:
+    def test_valid_blueprint(self):
+        assert validate_blueprint(VALID_BLUEPRINT) == []
+
+    def test_reports_all_errors(self):
+        blueprint = VALID_BLUEPRINT | {'creator': '', 'description': []}
+        fields = {field for field, _ in validate_blueprint(blueprint)}
+        assert fields == {'creator', 'description'}
+
+    def test_reports_nested_field_path(self):
+        blueprint = VALID_BLUEPRINT | {'fonts': [{'name': ''}]}
+        assert [field for field, _ in validate_blueprint(blueprint)] == ['fonts.0.name']
+
+    def test_report_for_files(self, tmp_path):
+        valid, invalid, malformed = (tmp_path / str(i) for i in range(3))
+        valid.write_text(dumps(VALID_BLUEPRINT))
+        invalid.write_text(dumps(VALID_BLUEPRINT | {'series': {'font_id': 1, 'template_ids': []}}))
+        malformed.write_text('{')
+
+        report = validate_blueprints([valid, invalid, malformed], use_cache=False)
+        assert not report.passed
+        assert report.validated == 3
+        assert {issue.file for issue in report.issues} == {
+            invalid.as_posix(), malformed.as_posix()
+        }
+
+    def test_cache_only_keeps_validated_files(self, tmp_path):
+        cache_file = tmp_path / 'cache.json'
+        files = [tmp_path / str(i) for i in range(2)]
+        for file in files:
+            file.write_text(dumps(VALID_BLUEPRINT))
+
+        report = validate_blueprints(files, cache_file=cache_file)
+        assert (report.validated, report.cached) == (2, 0)
+        report = validate_blueprints(files, cache_file=cache_file)
+        assert (report.validated, report.cached) == (2, 2)
+
+        files[1].unlink()
+        report = validate_blueprints(files[:1], cache_file=cache_file)
+        assert (report.validated, report.cached) == (1, 1)
+        assert set(read_json(cache_file)['results']) == {files[0].as_posix()}
+        assert sorted(tmp_path.iterdir()) == sorted([cache_file, files[0]])